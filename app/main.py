@@ -1,12 +1,37 @@
+from typing import Dict, List
 from fastapi import FastAPI
-from app.signal_engine import generate_signal
+from pydantic import BaseModel
+from app.signal_engine import DEFAULT_SYMBOL, generate_signal, generate_signals
 
 app = FastAPI(title="AI Trading Bot", version="1.0")
 
+class BatchRequest(BaseModel):
+    """Prices for one symbol (``prices``/``symbol``) and/or many (``series``)."""
+
+    prices: List[float] = []
+    symbol: str = DEFAULT_SYMBOL
+    series: Dict[str, List[float]] = {}
+    stateless: bool = False
+
 @app.get("/")
-def root():
+async def root():
     return {"status": "running", "message": "AI Trading Bot Backend Ready"}
 
 @app.get("/signal")
-def get_signal(price: float):
-    return generate_signal(price)
+async def get_signal(price: float, symbol: str = DEFAULT_SYMBOL):
+    # Async so FastAPI runs it on the event loop instead of its threadpool.
+    # Engine updates never await, so each one runs to completion before the
+    # next request's: updates are serialized without locks.
+    return generate_signal(price, symbol)
+
+@app.post("/signal/batch")
+async def get_signals(request: BatchRequest):
+    series = dict(request.series)
+    if request.prices:
+        series[request.symbol] = request.prices
+    return {
+        "signals": {
+            symbol: generate_signals(prices, symbol, request.stateless)
+            for symbol, prices in series.items()
+        }
+    }
@@ -1,19 +1,166 @@
+import os
+import time
 import numpy as np
+import indicators
+from collections import OrderedDict
 
-prices = []
+# Registry limits: engines kept at most, and seconds before an unused one is dropped
+MAX_SYMBOLS = int(os.environ.get("SIGNAL_MAX_SYMBOLS", 10_000))
+IDLE_TTL = float(os.environ.get("SIGNAL_IDLE_TTL", 3600))
 
-def generate_signal(price: float):
-    prices.append(price)
+DEFAULT_SYMBOL = "default"
 
-    if len(prices) < 10:
-        return {"signal": "WAIT", "reason": "Collecting data", "price": price}
 
-    short = np.mean(prices[-5:])
-    long = np.mean(prices[-10:])
+class CrossoverEngine:
+    """Short/long SMA crossover kept in O(1) per price.
 
-    if short > long:
-        return {"signal": "BUY", "price": price}
-    elif short < long:
-        return {"signal": "SELL", "price": price}
-    
-    return {"signal": "HOLD", "price": price}
+    Both averages are streaming ``indicators.SMA`` objects updated once per
+    price; ``generate_batch`` uses the vectorized ``indicators.sma`` over the
+    same window, so both paths agree.
+    """
+
+    def __init__(self, short: int = 5, long: int = 10, resync: int = 10_000):
+        if not 0 < short <= long:
+            raise ValueError("need 0 < short <= long")
+        self.short = short
+        self.long = long
+        self._short = indicators.SMA(short, resync)
+        self._long = indicators.SMA(long, resync)
+
+    def __len__(self):
+        return min(self._long.count, self.long)
+
+    def update(self, price: float):
+        self._short.update(price)
+        self._long.update(price)
+
+    @property
+    def ready(self):
+        return self._long.ready
+
+    @property
+    def short_mean(self):
+        return self._short.value
+
+    @property
+    def long_mean(self):
+        return self._long.value
+
+    def generate(self, price: float):
+        self.update(price)
+
+        if not self.ready:
+            return {"signal": "WAIT", "reason": "Collecting data", "price": price}
+
+        short = self.short_mean
+        long = self.long_mean
+        tolerance = 1e-12 * max(abs(short), abs(long))
+
+        if short > long + tolerance:
+            return {"signal": "BUY", "price": price}
+        elif short < long - tolerance:
+            return {"signal": "SELL", "price": price}
+
+        return {"signal": "HOLD", "price": price}
+
+    def window(self):
+        """Buffered prices, oldest first."""
+        return self._long.window()
+
+    def generate_batch(self, prices):
+        """Signals for a whole price series in one vectorized pass.
+
+        Gives the same labels as calling ``generate`` once per price, and
+        leaves the engine in the same state.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        n = prices.size
+        if n == 0:
+            return []
+
+        history = np.array(self.window()[-(self.long - 1):] if self.long > 1 else [], dtype=np.float64)
+        full = np.concatenate([history, prices])
+        count = self._long.count
+        short = indicators.sma(full, self.short)[history.size:]
+        long = indicators.sma(full, self.long)[history.size:]
+        ready = count + np.arange(1, n + 1) >= self.long
+        tolerance = 1e-12 * np.maximum(np.abs(short), np.abs(long))
+
+        labels = np.full(n, "HOLD", dtype=object)
+        with np.errstate(invalid="ignore"):
+            labels[short > long + tolerance] = "BUY"
+            labels[short < long - tolerance] = "SELL"
+        labels[~ready] = "WAIT"
+
+        self._short.seed(full)
+        self._long.seed(full)
+        self._short.count = self._long.count = count + n
+
+        return labels.tolist()
+
+
+class EngineRegistry:
+    """Per-symbol engines, so symbols never share price windows.
+
+    Not thread-safe by design: use it from a single thread (in the API,
+    the event loop). Nothing in it awaits, so async callers cannot
+    interleave within an update.
+
+    Engines are kept in least-recently-used order. Memory is capped at
+    ``max_symbols`` engines; beyond that, and for symbols unused for
+    ``idle_ttl`` seconds (0 disables), the least recently used are evicted.
+    """
+
+    def __init__(self, factory=CrossoverEngine, max_symbols=MAX_SYMBOLS, idle_ttl=IDLE_TTL):
+        self.factory = factory
+        self.max_symbols = max_symbols
+        self.idle_ttl = idle_ttl
+        self.evicted = 0
+        self._engines = OrderedDict()
+
+    def __len__(self):
+        return len(self._engines)
+
+    def __contains__(self, symbol):
+        return symbol in self._engines
+
+    def get(self, symbol: str) -> CrossoverEngine:
+        now = time.monotonic()
+        entry = self._engines.pop(symbol, None)
+        engine = entry[0] if entry else self.factory()
+        self._engines[symbol] = (engine, now)
+        self._evict(now)
+        return engine
+
+    def _evict(self, now):
+        engines = self._engines
+        while len(engines) > self.max_symbols:
+            engines.popitem(last=False)
+            self.evicted += 1
+        if self.idle_ttl:
+            while engines:
+                _, last_used = next(iter(engines.values()))
+                if now - last_used <= self.idle_ttl:
+                    break
+                engines.popitem(last=False)
+                self.evicted += 1
+
+
+registry = EngineRegistry()
+
+
+def generate_signal(price: float, symbol: str = DEFAULT_SYMBOL):
+    signal = registry.get(symbol).generate(price)
+    signal["symbol"] = symbol
+    return signal
+
+
+def generate_signals(prices, symbol: str = DEFAULT_SYMBOL, stateless: bool = False):
+    """Signal labels for a price series.
+
+    By default the series continues the symbol's live state, as if each
+    price had gone through ``generate_signal``. With ``stateless`` it is
+    evaluated on a fresh engine and live state is untouched.
+    """
+    engine = CrossoverEngine() if stateless else registry.get(symbol)
+    return engine.generate_batch(prices)
@@ -1,14 +1,15 @@
 import time
 import random
 from app.signal_engine import generate_signal
+from app.symbols import SYMBOLS
 
-def run_worker():
-    print("Worker Started - Monitoring Market ...")
+def run_worker(symbol=SYMBOLS[0]):
+    print(f"Worker Started - Monitoring Market ({symbol}) ...")
 
     while True:
         price = round(random.uniform(20000, 21000), 2)
-        signal = generate_signal(price)
-        print(f"[Worker] Price: {price} | Signal: {signal['signal']}")
+        signal = generate_signal(price, symbol)
+        print(f"[Worker] {symbol} Price: {price} | Signal: {signal['signal']}")
         time.sleep(5)
 
 if __name__ == "__main__":
@@ -1,8 +1,29 @@
 import os
+import json
 import logging
 import asyncio
 from datetime import datetime, timezone, timedelta
 from aiohttp import web
+import fetcher
+import formats
+import sniper_loop
+from config import (
+    BACKFILL_BARS,
+    MAX_HISTORY,
+    PAIRS,
+    POLL_INTERVAL,
+    POLL_OFFSET,
+    SNIPER_INPROCESS,
+    STREAM_HEARTBEAT,
+    STREAM_QUEUE_SIZE,
+)
+from bus import SignalBus
+from compression import compression_middleware
+from indicators import IndicatorSet
+from providers import make_provider
+from responses import CachedResponse
+from scheduler import Ticker
+from store import PriceHistory, format_epoch_ms, to_epoch_ms
 
 # ============================
 # Timezone: Nigeria UTC+1
@@ -26,70 +47,348 @@ logger = logging.getLogger(__name__)
 # ============================
 # In-memory store
 # ============================
-price_data = {
-    "EUR/USD": [],
-    "AUD/USD": []
-}
-signal_data = {
-    "EUR/USD": {},
-    "AUD/USD": {}
-}
+price_data = {pair: PriceHistory(MAX_HISTORY) for pair in PAIRS}
+signal_data = {pair: {} for pair in PAIRS}
+indicator_state = {pair: IndicatorSet() for pair in price_data}
+
+# Pre-encoded responses, rebuilt by the poller whenever a pair updates.
+# price_cache[pair] maps content type -> full history, encoded on the first
+# request after an update so idle pairs cost nothing per tick.
+price_cache = {}
+signal_cache = {}
+
+def encode_price(pair, content_type, lo, hi, meta):
+    body, headers = formats.encode(content_type, price_data[pair], lo, hi, meta)
+    return CachedResponse(body, content_type, {**headers, "Vary": "Accept"})
+
+def cached_price(pair, content_type):
+    variants = price_cache[pair]
+    if content_type not in variants:
+        variants[content_type] = encode_price(pair, content_type, 0, len(price_data[pair]), {"symbol": pair})
+    return variants[content_type]
+
+def refresh_cache(pair):
+    price_cache[pair] = {}
+    signal_cache[pair] = CachedResponse.json(signal_data[pair])
+
+def join_signals(pairs):
+    """Bulk /signals body spliced from the per-pair pre-encoded bodies."""
+    bodies = [signal_cache[pair].body for pair in pairs if signal_data[pair]]
+    return CachedResponse(b'{"signals":[' + b",".join(bodies) + b"]}")
+
+for _pair in price_data:
+    refresh_cache(_pair)
+signals_cache = join_signals(signal_data)
+
+# Live signal updates pushed to WebSocket/SSE clients
+signal_bus = SignalBus(STREAM_QUEUE_SIZE)
 
 # ============================
 # Routes
 # ============================
 async def health(request):
+    if not ready.is_set():
+        return web.json_response({"status": "starting"}, status=503)
     return web.json_response({"status": "ok"})
 
+async def metrics(request):
+    return web.json_response({
+        "poller": {**ticker.stats(), "provider": provider.name},
+        "streams": {"clients": len(signal_bus), "dropped": signal_bus.dropped}
+    })
+
+def query_int(request, name):
+    value = request.query.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{name} must be an integer")
+
 async def price(request):
+    """Price history for a pair.
+
+    Without query options the full cached history is served. ``since`` and
+    ``until`` (epoch ms, inclusive) select a time window, ``limit`` keeps
+    the newest bars in it, and ``cursor`` pages backwards: pass the
+    ``next_cursor`` from the previous page to get the bars before it.
+
+    The encoding follows ``?format=`` or the Accept header: row JSON
+    (default), columnar JSON, MessagePack, Arrow IPC or raw little-endian
+    column buffers; see ``formats``.
+    """
     pair = request.query.get("pair")
-    if pair not in price_data:
+    if pair not in price_cache:
         return web.Response(status=404, text="Not Found")
-    return web.json_response({"meta": {"symbol": pair}, "values": price_data[pair]})
+    content_type = formats.negotiate(request.headers.get("Accept"), request.query.get("format"))
+    if content_type is None:
+        raise web.HTTPNotAcceptable(text="Available formats: " + ", ".join(formats.available()))
+    limit = query_int(request, "limit")
+    since = query_int(request, "since")
+    until = query_int(request, "until")
+    cursor = query_int(request, "cursor")
+    if limit is None and since is None and until is None and cursor is None:
+        return cached_price(pair, content_type).respond(request)
+    if limit is not None and limit <= 0:
+        raise web.HTTPBadRequest(text="limit must be positive")
+
+    history = price_data[pair]
+    if cursor is not None:
+        until = cursor - 1 if until is None else min(until, cursor - 1)
+    first, hi = history.search(since, until)
+    lo = first if limit is None else max(first, hi - limit)
+    meta = {"symbol": pair, "next_cursor": None}
+    if lo > first:
+        meta["next_cursor"] = int(history.window("timestamp", lo, lo + 1)[0])
+    return encode_price(pair, content_type, lo, hi, meta).respond(request)
 
 async def signal(request):
     pair = request.query.get("pair")
-    if pair not in signal_data:
+    if pair not in signal_cache:
         return web.Response(status=404, text="Not Found")
-    return web.json_response(signal_data[pair])
+    return signal_cache[pair].respond(request)
+
+async def signals(request):
+    """All current signals in one response.
+
+    ``pairs=A,B`` restricts the pairs; ``since`` (epoch ms) keeps only
+    signals whose server-side ``updated`` stamp is after it.
+    """
+    pairs = parse_pairs(request.query.get("pairs"))
+    since = request.query.get("since")
+    if pairs is None and since is None:
+        return signals_cache.respond(request)
+    try:
+        since = int(since) if since is not None else None
+    except ValueError:
+        return web.Response(status=400, text="since must be an epoch timestamp in milliseconds")
+    selected = [
+        pair for pair in (pairs if pairs is not None else signal_data)
+        if pair in signal_data and (since is None or signal_data[pair].get("updated", 0) > since)
+    ]
+    return join_signals(selected).respond(request)
 
-app = web.Application()
+# ============================
+# Push streams: WebSocket and Server-Sent Events
+# ============================
+def parse_pairs(value):
+    if not value:
+        return None
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+def current_signals(subscription):
+    return [
+        signal_cache[pair].body
+        for pair in signal_cache
+        if subscription.wants(pair) and signal_data[pair]
+    ]
+
+async def ws_stream(request):
+    """WebSocket feed of signal updates.
+
+    Optional ``?pairs=A,B`` sets the initial subscription (default: all).
+    Clients change it by sending ``{"action": "subscribe"|"unsubscribe",
+    "pairs": [...]}``. Clients that fall behind are disconnected.
+    """
+    ws = web.WebSocketResponse(heartbeat=STREAM_HEARTBEAT)
+    await ws.prepare(request)
+    subscription = signal_bus.subscribe(parse_pairs(request.query.get("pairs")))
+
+    async def sender():
+        for body in current_signals(subscription):
+            await ws.send_str(body.decode())
+        async for event in subscription:
+            await ws.send_str(event.body.decode())
+        if not ws.closed:
+            await ws.close(code=web.WSCloseCode.TRY_AGAIN_LATER, message=b"Too slow")
+
+    send_task = asyncio.create_task(sender())
+    try:
+        async for msg in ws:
+            if msg.type != web.WSMsgType.TEXT:
+                continue
+            try:
+                command = json.loads(msg.data)
+                action, pairs = command["action"], command["pairs"]
+                if action not in ("subscribe", "unsubscribe"):
+                    raise ValueError(action)
+                if not isinstance(pairs, list) or not all(isinstance(p, str) for p in pairs):
+                    raise TypeError(pairs)
+            except (ValueError, KeyError, TypeError):
+                await ws.send_str(json.dumps({"error": "Expected {\"action\": \"subscribe\"|\"unsubscribe\", \"pairs\": [...]}"}))
+                continue
+            if action == "subscribe":
+                subscription.subscribe(pairs)
+            elif action == "unsubscribe":
+                subscription.unsubscribe(pairs)
+    finally:
+        subscription.close()
+        send_task.cancel()
+        try:
+            await send_task
+        except (asyncio.CancelledError, ConnectionResetError):
+            pass
+    return ws
+
+async def sse_stream(request):
+    """Server-Sent Events feed of signal updates, filtered by ``?pairs=A,B``."""
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+    subscription = signal_bus.subscribe(parse_pairs(request.query.get("pairs")))
+    try:
+        for body in current_signals(subscription):
+            await response.write(b"event: signal\ndata: " + body + b"\n\n")
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                await response.write(b": keep-alive\n\n")
+                continue
+            if event is None:
+                break
+            await response.write(b"event: signal\ndata: " + event.body + b"\n\n")
+    except ConnectionResetError:
+        pass
+    finally:
+        subscription.close()
+    return response
+
+app = web.Application(middlewares=[compression_middleware()])
 app.add_routes([
     web.get("/health", health),
+    web.get("/metrics", metrics),
     web.get("/price", price),
-    web.get("/signal", signal)
+    web.get("/signal", signal),
+    web.get("/signals", signals),
+    web.get("/ws", ws_stream),
+    web.get("/stream", sse_stream)
 ])
 
 # ============================
-# Poller: Fetch mock prices every 60 seconds
-# Replace this with real API call using TWELVEDATA_API_KEY
+# Poller: backfill history once, then fetch the latest closed bar of every
+# pair on each aligned tick
 # ============================
+provider = make_provider()
+ticker = Ticker(POLL_INTERVAL, POLL_OFFSET)
+ready = asyncio.Event()
+last_updated = 0
+
+def update_stamp():
+    """Server update time in epoch ms, strictly increasing across pairs.
+
+    /signals filters ``since`` on this rather than on bar times, because a
+    late pair can take in a bar older than another pair's latest.
+    """
+    global last_updated
+    last_updated = max(to_epoch_ms(datetime.now(timezone.utc)), last_updated + 1)
+    return last_updated
+
+def update_signal(pair, bar, values):
+    """Publish a pair's signal from its indicator snapshot, computed once per bar."""
+    rsi = values["rsi"]
+    signal_data[pair] = {
+        "pair": pair,
+        "signal": "SELL" if bar.close < bar.open else "BUY",
+        "open": bar.open,
+        "close": bar.close,
+        "rsi": None if rsi is None else round(rsi, 2),
+        "indicators": values,
+        "datetime": format_epoch_ms(bar.timestamp),
+        "timestamp": bar.timestamp,
+        "updated": update_stamp()
+    }
+    refresh_cache(pair)
+    signal_bus.publish(pair, signal_data[pair], signal_cache[pair].body)
+
+async def backfill():
+    """Load up to BACKFILL_BARS bars per pair and warm indicator state."""
+    global signals_cache
+    if BACKFILL_BARS <= 0:
+        return
+    try:
+        histories = await provider.history(PAIRS, min(BACKFILL_BARS, MAX_HISTORY), to_epoch_ms(datetime.now(NIGERIA_TZ)))
+    except Exception as e:
+        logger.exception(f"Backfill failed: {e}")
+        return
+    for pair, bars in histories.items():
+        if not bars:
+            continue
+        history = price_data[pair]
+        history.extend(bars)
+        values = indicator_state[pair].seed(history.highs(), history.lows(), history.closes())
+        update_signal(pair, history.last(), values)
+    signals_cache = join_signals(signal_data)
+    logger.info(f"Backfilled {len(histories)}/{len(PAIRS)} pairs from {provider.name}")
+
 async def poller():
-    while True:
-        now = datetime.now(NIGERIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
-        for pair in price_data.keys():
-            open_price = round(1.15 + 0.0001, 5)  # Example mock
-            close_price = round(1.15, 5)
-            price_data[pair].append({
-                "datetime": now,
-                "open": open_price,
-                "close": close_price
-            })
-            signal_data[pair] = {
-                "pair": pair,
-                "signal": "SELL" if close_price < open_price else "BUY",
-                "open": open_price,
-                "close": close_price,
-                "datetime": now
-            }
-        logger.info(f"Updated prices and signals at {now}")
-        await asyncio.sleep(60)
+    global signals_cache
+    await backfill()
+    ready.set()
+    async for boundary in ticker:
+        tick = datetime.fromtimestamp(boundary, NIGERIA_TZ)
+        now = tick.strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            bars = await provider.latest(PAIRS, to_epoch_ms(tick))
+        except Exception as e:
+            logger.exception(f"Poll failed at {now}: {e}")
+            continue
+        updated = 0
+        for pair, bar in bars.items():
+            history = price_data[pair]
+            if bar is None or (len(history) and bar.timestamp <= history.timestamps(1)[0]):
+                continue  # no new closed bar for this pair yet
+            history.append(bar)
+            update_signal(pair, bar, indicator_state[pair].update(bar.high, bar.low, bar.close))
+            updated += 1
+        signals_cache = join_signals(signal_data)
+        logger.info(
+            f"Updated {updated}/{len(PAIRS)} pairs from {provider.name} at {now} "
+            f"(lag {ticker.last_lag * 1000:.1f} ms)"
+        )
+
+# ============================
+# App lifecycle: shared HTTP session + poller task
+# ============================
+async def start_poller(app):
+    app["poller"] = asyncio.create_task(poller())
+
+async def stop_poller(app):
+    app["poller"].cancel()
+    try:
+        await app["poller"]
+    except asyncio.CancelledError:
+        pass
+
+async def start_sniper(app):
+    app["sniper"] = asyncio.create_task(sniper_loop.run_inprocess(signal_bus))
+
+async def stop_sniper(app):
+    app["sniper"].cancel()
+    try:
+        await app["sniper"]
+    except asyncio.CancelledError:
+        pass
+
+async def close_streams(app):
+    signal_bus.close_all()
+
+app.on_startup.append(fetcher.client.on_startup)
+app.on_startup.append(start_poller)
+app.on_shutdown.append(close_streams)
+app.on_cleanup.append(stop_poller)
+if SNIPER_INPROCESS:
+    app.on_startup.append(start_sniper)
+    app.on_cleanup.append(stop_sniper)
+app.on_cleanup.append(fetcher.client.on_cleanup)
 
 # ============================
 # Run web app
 # ============================
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
-    loop = asyncio.get_event_loop()
-    loop.create_task(poller())
     web.run_app(app, host="0.0.0.0", port=port)
@@ -0,0 +1,108 @@
+import asyncio
+from collections import namedtuple
+
+SignalEvent = namedtuple("SignalEvent", ["pair", "data", "body"])
+
+_CLOSED = object()
+
+
+class Subscription:
+    """A subscriber's pair filter and bounded queue of pending events.
+
+    ``pairs`` is None for an all-pairs subscription; pairs unsubscribed
+    from it are kept in ``excluded`` instead.
+    """
+
+    def __init__(self, bus, pairs=None, maxsize=100):
+        self._bus = bus
+        self.queue = asyncio.Queue(maxsize)
+        self.pairs = set(pairs) if pairs else None
+        self.excluded = set()
+        self.closed = False
+
+    def wants(self, pair):
+        if self.pairs is None:
+            return pair not in self.excluded
+        return pair in self.pairs
+
+    def subscribe(self, pairs):
+        if self.pairs is None:
+            self.excluded.difference_update(pairs)
+        else:
+            self.pairs.update(pairs)
+
+    def unsubscribe(self, pairs):
+        if self.pairs is None:
+            self.excluded.update(pairs)
+        else:
+            self.pairs.difference_update(pairs)
+
+    def close(self):
+        """Detach from the bus and wake the consumer with end-of-stream."""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus.unsubscribe(self)
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSED)
+
+    async def get(self):
+        """Next event, or None once the subscription is closed."""
+        event = await self.queue.get()
+        if event is _CLOSED:
+            self.queue.put_nowait(_CLOSED)
+            return None
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class SignalBus:
+    """In-memory pub/sub of signal updates.
+
+    ``publish`` never blocks: a subscriber whose queue is full is considered
+    too slow and is dropped, so one stalled client cannot hold up the
+    poller or anyone else.
+    """
+
+    def __init__(self, maxsize=100):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._subscriptions = set()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, pairs=None, maxsize=None) -> Subscription:
+        """Register a subscriber; ``maxsize=0`` gives an unbounded queue
+        for trusted in-process consumers that must never be dropped."""
+        maxsize = self.maxsize if maxsize is None else maxsize
+        subscription = Subscription(self, pairs, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, pair, data, body=None):
+        event = SignalEvent(pair, data, body)
+        for subscription in list(self._subscriptions):
+            if not subscription.wants(pair):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                subscription.close()
+
+    def close_all(self):
+        for subscription in list(self._subscriptions):
+            subscription.close()
@@ -0,0 +1,102 @@
+import gzip
+from aiohttp import web
+from config import COMPRESS_MIN_SIZE
+from negotiation import parse_accept
+
+try:
+    import brotli
+except ImportError:  # optional: br is not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is not offered
+    zstandard = None
+
+# Server preference when the client weights several encodings equally
+CODECS = {}
+if zstandard is not None:
+    CODECS["zstd"] = zstandard.ZstdCompressor(level=10).compress
+if brotli is not None:
+    CODECS["br"] = lambda data: brotli.compress(data, quality=9)
+CODECS["gzip"] = lambda data: gzip.compress(data, compresslevel=9)
+
+
+def compress(encoding, body: bytes) -> bytes:
+    return CODECS[encoding](body)
+
+
+def negotiate_encoding(accept_encoding):
+    """Best supported coding from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = dict(parse_accept(accept_encoding))
+
+    best, best_q = None, 0.0
+    for coding in CODECS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def strip_encoding(etag):
+    """Map a per-encoding ETag back to the uncompressed one."""
+    for coding in CODECS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def add_vary(response, value):
+    vary = response.headers.get("Vary")
+    if not vary:
+        response.headers["Vary"] = value
+    elif value.lower() not in vary.lower():
+        response.headers["Vary"] = f"{vary}, {value}"
+
+
+def compression_middleware(min_size=COMPRESS_MIN_SIZE):
+    """Compress response bodies of at least ``min_size`` bytes.
+
+    Responses built by ``CachedResponse.respond`` reuse the compressed copy
+    cached on it, so each payload is compressed once per update rather than
+    once per request. Streaming responses are left alone.
+    """
+    @web.middleware
+    async def middleware(request, handler):
+        response = await handler(request)
+        cached = response.get("cached") if isinstance(response, web.Response) else None
+        if response.status == 304 and cached is not None and len(cached.body) >= min_size:
+            # Keep the 304's validator identical to the variant the client holds
+            add_vary(response, "Accept-Encoding")
+            encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+            if encoding is not None:
+                response.headers["ETag"] = f'{cached.etag[:-1]}-{encoding}"'
+            return response
+        if (
+            not isinstance(response, web.Response)
+            or response.status != 200
+            or "Content-Encoding" in response.headers
+            or not isinstance(response.body, (bytes, bytearray))
+            or len(response.body) < min_size
+        ):
+            return response
+
+        add_vary(response, "Accept-Encoding")
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        if cached is not None:
+            response.body = cached.compressed(encoding)
+        else:
+            response.body = compress(encoding, response.body)
+        response.headers["Content-Encoding"] = encoding
+        etag = response.headers.get("ETag")
+        if etag:
+            response.headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+        return response
+
+    return middleware
@@ -4,16 +4,58 @@ from datetime import timezone, timedelta
 # Nigeria timezone UTC+1
 NIGERIA_TZ = timezone(timedelta(hours=1))
 
-# Load TwelveData API Key from environment
-TWELVEDATA_API_KEY = os.environ.get("TWELVE_API_KEY")
+# Load TwelveData API Key from environment (TWELVE_API_KEY is the old name)
+TWELVEDATA_API_KEY = os.environ.get("TWELVEDATA_API_KEY") or os.environ.get("TWELVE_API_KEY")
 
-# Default trading pairs
-PAIRS = [
-    "EUR/USD",
-    "GBP/USD",
-    "XAU/USD",
-    "BTC/USD"
-]
+
+def env_list(name, default):
+    """Comma-separated list from the environment, or ``default``."""
+    value = os.environ.get(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+# Trading pairs polled by the backend and alerted by the sniper loop
+PAIRS = env_list("PAIRS", ["EUR/USD", "AUD/USD"])
+
+# TwelveData accepts up to this many comma-separated symbols per request
+TWELVEDATA_BATCH_SIZE = int(os.environ.get("TWELVEDATA_BATCH_SIZE", 120))
+
+# Poller schedule: tick on wall-clock boundaries of POLL_INTERVAL seconds,
+# POLL_OFFSET seconds after each boundary so the 1-minute candle has closed
+POLL_INTERVAL = float(os.environ.get("POLL_INTERVAL", 60))
+POLL_OFFSET = float(os.environ.get("POLL_OFFSET", 2))
+
+# Market data source for the backend poller: "twelvedata", "synthetic" or
+# "replay". Defaults to TwelveData when an API key is set.
+MARKET_DATA_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER") or ("twelvedata" if TWELVEDATA_API_KEY else "synthetic")
+SYNTHETIC_VOLATILITY = float(os.environ.get("SYNTHETIC_VOLATILITY", 0.0005))
+SYNTHETIC_SEED = int(os.environ["SYNTHETIC_SEED"]) if os.environ.get("SYNTHETIC_SEED") else None
+REPLAY_FILE = os.environ.get("REPLAY_FILE")
+
+# Poller fan-out: max in-flight fetches, and the TwelveData plan's credit budget
+POLL_CONCURRENCY = int(os.environ.get("POLL_CONCURRENCY", 8))
+TWELVEDATA_CREDITS_PER_MINUTE = int(os.environ.get("TWELVEDATA_CREDITS_PER_MINUTE", 8))
+
+# Push streaming (WebSocket/SSE): per-client queue bound and SSE keep-alive
+STREAM_QUEUE_SIZE = int(os.environ.get("STREAM_QUEUE_SIZE", 100))
+STREAM_HEARTBEAT = float(os.environ.get("STREAM_HEARTBEAT", 15))
+
+# Run the Telegram sniper loop inside backend.py, fed by the in-memory signal bus
+SNIPER_INPROCESS = os.environ.get("SNIPER_INPROCESS", "").lower() in ("1", "true", "yes")
+
+# Only compress response bodies at least this many bytes long
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
 
 # Price history limit
 MAX_HISTORY = 500
+
+# Bars per pair to load on startup before /health reports ready (0 = none)
+BACKFILL_BARS = int(os.environ.get("BACKFILL_BARS", MAX_HISTORY))
+
+# Shared HTTP client settings (connection pool, keep-alive, DNS cache, timeouts)
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 20))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))
+HTTP_DNS_CACHE_TTL = int(os.environ.get("HTTP_DNS_CACHE_TTL", 300))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_TOTAL_TIMEOUT = float(os.environ.get("HTTP_TOTAL_TIMEOUT", 15))
@@ -1,30 +1,204 @@
 import aiohttp
+import asyncio
 import logging
-from config import TWELVEDATA_API_KEY
+from config import (
+    PAIRS,
+    TWELVEDATA_API_KEY,
+    TWELVEDATA_BATCH_SIZE,
+    HTTP_POOL_LIMIT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT,
+)
+from store import Bar
 
 BASE_URL = "https://api.twelvedata.com/time_series"
 
 logger = logging.getLogger("fetcher")
 
-async def fetch_price(pair: str):
-    """Fetch real-time 1-minute data for a pair."""
+
+class HTTPClient:
+    """Owns one long-lived, pooled aiohttp session.
+
+    ``on_startup``/``on_cleanup`` can be appended to an aiohttp app's
+    lifecycle signals; outside an app the session is opened lazily.
+    """
+
+    def __init__(
+        self,
+        limit=HTTP_POOL_LIMIT,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=HTTP_DNS_CACHE_TTL,
+        connect_timeout=HTTP_CONNECT_TIMEOUT,
+        total_timeout=HTTP_TOTAL_TIMEOUT,
+    ):
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def start(self):
+        return self.session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def on_startup(self, app):
+        await self.start()
+
+    async def on_cleanup(self, app):
+        await self.close()
+
+
+client = HTTPClient()
+
+
+class FetchResult:
+    """Outcome of fetching one symbol: its bars (newest first) or an error message."""
+
+    __slots__ = ("symbol", "values", "error")
+
+    def __init__(self, symbol, values=None, error=None):
+        self.symbol = symbol
+        self.values = values
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f"FetchResult({self.symbol!r}, values={len(self.values)})"
+        return f"FetchResult({self.symbol!r}, error={self.error!r})"
+
+
+def _parse_series(symbol, data):
+    if not isinstance(data, dict):
+        return FetchResult(symbol, error=f"Unexpected response: {data!r}")
+    if data.get("status") == "error" or "values" not in data:
+        return FetchResult(symbol, error=data.get("message") or str(data))
+    try:
+        bars = [Bar.from_twelvedata(values) for values in data["values"]]
+    except (KeyError, TypeError, ValueError) as e:
+        return FetchResult(symbol, error=f"Malformed bar: {e!r}")
+    return FetchResult(symbol, values=bars)
+
+
+def parse_batch(symbols, data):
+    """Split a time_series response into one FetchResult per symbol.
+
+    A single-symbol request gets a flat series back; a multi-symbol request
+    gets a dict keyed by symbol, unless the whole request failed.
+    """
+    if len(symbols) == 1:
+        return {symbols[0]: _parse_series(symbols[0], data)}
+    if not isinstance(data, dict):
+        error = f"Unexpected response: {data!r}"
+        return {symbol: FetchResult(symbol, error=error) for symbol in symbols}
+    if data.get("status") == "error" and "code" in data:
+        error = data.get("message") or str(data)
+        return {symbol: FetchResult(symbol, error=error) for symbol in symbols}
+    return {
+        symbol: _parse_series(symbol, data.get(symbol, {"message": "Missing from response"}))
+        for symbol in symbols
+    }
+
+
+def chunked(items, size):
+    items = list(dict.fromkeys(items))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def _fetch_chunk(symbols, outputsize, session, limiter=None, semaphore=None):
+    if limiter is not None:
+        await limiter.acquire(len(symbols))  # one credit per symbol
+    if semaphore is not None:
+        async with semaphore:
+            return await _fetch_chunk(symbols, outputsize, session)
+
+    params = {
+        "symbol": ",".join(symbols),
+        "interval": "1min",
+        "apikey": TWELVEDATA_API_KEY,
+        "outputsize": outputsize,
+        "timezone": "UTC"
+    }
+    try:
+        async with session.get(BASE_URL, params=params) as r:
+            data = await r.json()
+    except Exception as e:
+        logger.exception(f"Fetch error for {params['symbol']}: {e}")
+        return {symbol: FetchResult(symbol, error=str(e)) for symbol in symbols}
+
+    results = parse_batch(symbols, data)
+    for result in results.values():
+        if not result.ok:
+            logger.error(f"TwelveData error for {result.symbol}: {result.error}")
+    return results
+
+
+async def fetch_prices(pairs=None, outputsize: int = 1, batch_size: int = TWELVEDATA_BATCH_SIZE,
+                       session: aiohttp.ClientSession = None, limiter=None, concurrency: int = None):
+    """Fetch 1-minute bars for many pairs in as few requests as possible.
+
+    Chunk requests run concurrently, at most ``concurrency`` at a time, and
+    each first takes one credit per symbol from ``limiter`` (a
+    ``ratelimit.TokenBucket``) when given.
+
+    ``pairs`` defaults to ``config.PAIRS``; any watchlist (for example
+    ``app.symbols.SYMBOLS``) can be passed. Returns ``{pair: FetchResult}``
+    with values newest first, as TwelveData sends them.
+    """
+    pairs = PAIRS if pairs is None else pairs
+    session = session or client.session
+    if limiter is not None:
+        batch_size = min(batch_size, int(limiter.capacity))
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+    chunks = chunked(pairs, batch_size)
+    results = {}
+    fetches = (_fetch_chunk(c, outputsize, session, limiter, semaphore) for c in chunks)
+    for chunk_results in await asyncio.gather(*fetches):
+        results.update(chunk_results)
+    return results
+
+
+async def fetch_price(pair: str, session: aiohttp.ClientSession = None):
+    """Fetch the latest 1-minute ``Bar`` for a pair."""
     params = {
         "symbol": pair,
         "interval": "1min",
         "apikey": TWELVEDATA_API_KEY,
-        "outputsize": 1
+        "outputsize": 1,
+        "timezone": "UTC"
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(BASE_URL, params=params) as r:
-                data = await r.json()
+        session = session or client.session
+        async with session.get(BASE_URL, params=params) as r:
+            data = await r.json()
 
         if "values" not in data:
             logger.error(f"TwelveData error for {pair}: {data}")
             return None
 
-        return data["values"][0]
+        return Bar.from_twelvedata(data["values"][0])
 
     except Exception as e:
         logger.exception(f"Fetch error for {pair}: {e}")
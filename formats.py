@@ -0,0 +1,118 @@
+import sys
+from negotiation import parse_accept
+from responses import dumps
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePack responses are not offered
+    msgpack = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # optional: Arrow IPC responses are not offered
+    pyarrow = None
+
+JSON = "application/json"
+COLUMNS = "application/vnd.silvercoin.columns+json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+RAW = "application/octet-stream"
+
+ALIASES = {
+    "json": JSON,
+    "columns": COLUMNS,
+    "msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "arrow": ARROW,
+    "raw": RAW,
+}
+
+
+def available():
+    """Content types /price can produce with the installed packages."""
+    types = [JSON, COLUMNS, RAW]
+    if msgpack is not None:
+        types.append(MSGPACK)
+    if pyarrow is not None:
+        types.append(ARROW)
+    return types
+
+
+def negotiate(accept=None, fmt=None):
+    """Pick a content type from ``?format=`` or the Accept header.
+
+    Returns None when nothing acceptable can be produced (HTTP 406).
+    """
+    offered = available()
+    if fmt:
+        content_type = ALIASES.get(fmt, fmt)
+        return content_type if content_type in offered else None
+    if not accept:
+        return JSON
+
+    ranges = [(ALIASES.get(media_type, media_type), q) for media_type, q in parse_accept(accept)]
+    # Types named explicitly keep their own q, even q=0, over any wildcard.
+    explicit = {media_type for media_type, _ in ranges}
+
+    for media_type, q in sorted(ranges, key=lambda r: -r[1]):
+        if q <= 0:
+            break
+        if media_type in ("*/*", "application/*"):
+            for candidate in [JSON] + offered:
+                if candidate not in explicit:
+                    return candidate
+            continue
+        if media_type in offered:
+            return media_type
+    return None
+
+
+def _columns(history, lo, hi):
+    return {name: history.window(name, lo, hi) for name in history.FIELDS}
+
+
+def encode(content_type, history, lo, hi, meta):
+    """Encode bars ``lo:hi`` of a ``PriceHistory``.
+
+    Returns ``(body, headers)``. Encoding runs without yielding to the event
+    loop, so the body is a consistent snapshot even while the poller appends.
+    """
+    if content_type == JSON:
+        return dumps({"meta": meta, "values": history.records(lo, hi)}), {}
+
+    columns = _columns(history, lo, hi)
+
+    if content_type == COLUMNS:
+        payload = {"meta": meta, "columns": {name: col.tolist() for name, col in columns.items()}}
+        return dumps(payload), {}
+
+    if content_type == MSGPACK:
+        payload = {"meta": meta, "columns": {name: col.tolist() for name, col in columns.items()}}
+        return msgpack.packb(payload), {}
+
+    if content_type == ARROW:
+        arrays = []
+        for name, col in columns.items():
+            if name == "timestamp":
+                arrays.append(pyarrow.array(col, type=pyarrow.timestamp("ms", tz="UTC")))
+            else:
+                arrays.append(pyarrow.array(col))
+        table = pyarrow.table(arrays, names=list(columns))
+        table = table.replace_schema_metadata({"meta": dumps(meta)})
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), {}
+
+    if content_type == RAW:
+        # Column buffers back to back, each little-endian, in X-Columns order.
+        buffers = [col if sys.byteorder == "little" else col.byteswap() for col in columns.values()]
+        headers = {
+            "X-Rows": str(hi - lo),
+            "X-Columns": ",".join(f"{name}:{col.dtype.name}" for name, col in columns.items()),
+            "X-Meta": dumps(meta).decode(),
+        }
+        return b"".join(memoryview(buf) for buf in buffers), headers
+
+    raise ValueError(f"Unsupported content type: {content_type}")
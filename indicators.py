@@ -0,0 +1,589 @@
+"""Technical indicators in two forms.
+
+Every indicator has a vectorized batch function over full NumPy arrays
+(``sma``, ``ema``, ``rsi``, ``macd``, ``bollinger``, ``atr``,
+``stochastic``) and a streaming class with an O(1) ``update`` (``SMA``,
+``EMA``, ``RSI``, ``MACD``, ``Bollinger``, ``ATR``, ``Stochastic``). Both
+forms give the same values up to floating-point rounding.
+
+Batch functions return arrays aligned with their input, NaN until the
+indicator has enough data. Streaming ``update`` returns the current value,
+or None until ready; ``seed`` rebuilds a streaming indicator from history
+arrays.
+"""
+import math
+import numpy as np
+from collections import deque
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _smooth(values, alpha, start):
+    """Exponential smoothing ``y = y_prev + alpha * (x - y_prev)`` from ``start``.
+
+    Vectorized in blocks through the closed form
+    ``y_j = d**(j+1) * (start + alpha * sum_i x_i * d**-(i+1))`` with
+    ``d = 1 - alpha``. Blocks are kept short enough that ``d**-m`` stays
+    below 1e15, so the scaled sums keep full precision.
+    """
+    values = _as_array(values)
+    out = np.empty_like(values)
+    if values.size == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    block = max(1, int(15 * math.log(10) / -math.log(decay)))
+    previous = start
+    for lo in range(0, values.size, block):
+        chunk = values[lo:lo + block]
+        powers = decay ** np.arange(1, chunk.size + 1)
+        out[lo:lo + chunk.size] = powers * (previous + alpha * np.cumsum(chunk / powers))
+        previous = out[lo + chunk.size - 1]
+    return out
+
+
+def _wilder(values, period):
+    """Mean of the first ``period`` values, then Wilder smoothing."""
+    values = _as_array(values)
+    out = np.full(values.size, np.nan)
+    if values.size < period:
+        return out
+    out[period - 1] = values[:period].mean()
+    out[period:] = _smooth(values[period:], 1.0 / period, out[period - 1])
+    return out
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss <= 0, 100.0, out)
+
+
+# ============================
+# Batch (vectorized) forms
+# ============================
+def sma(values, period):
+    values = _as_array(values)
+    out = np.full(values.size, np.nan)
+    if values.size < period:
+        return out
+    reference = values[0]
+    sums = np.concatenate([[0.0], np.cumsum(values - reference)])
+    out[period - 1:] = (sums[period:] - sums[:-period]) / period + reference
+    return out
+
+
+def ema(values, period, alpha=None):
+    """EMA seeded with the SMA of the first ``period`` values."""
+    values = _as_array(values)
+    alpha = 2.0 / (period + 1) if alpha is None else alpha
+    out = np.full(values.size, np.nan)
+    if values.size < period:
+        return out
+    out[period - 1] = values[:period].mean()
+    out[period:] = _smooth(values[period:], alpha, out[period - 1])
+    return out
+
+
+def rsi(values, period=14, smoothing="wilder"):
+    """RSI with Wilder smoothing, or a simple mean of the last ``period`` changes."""
+    values = _as_array(values)
+    out = np.full(values.size, np.nan)
+    if values.size < period + 1:
+        return out
+    changes = np.diff(values)
+    gains = np.maximum(changes, 0)
+    losses = np.maximum(-changes, 0)
+    if smoothing == "wilder":
+        avg_gain, avg_loss = _wilder(gains, period), _wilder(losses, period)
+    elif smoothing == "simple":
+        avg_gain, avg_loss = sma(gains, period), sma(losses, period)
+    else:
+        raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+    out[period:] = _rsi_from_averages(avg_gain[period - 1:], avg_loss[period - 1:])
+    return out
+
+
+def macd(values, fast=12, slow=26, signal=9):
+    """Returns ``(macd, signal, histogram)`` arrays."""
+    values = _as_array(values)
+    line = ema(values, fast) - ema(values, slow)
+    signal_line = np.full(values.size, np.nan)
+    if values.size >= slow:
+        signal_line[slow - 1:] = ema(line[slow - 1:], signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(values, period=20, k=2.0):
+    """Returns ``(middle, upper, lower)`` with a population standard deviation."""
+    values = _as_array(values)
+    middle = sma(values, period)
+    std = np.full(values.size, np.nan)
+    if values.size >= period:
+        std[period - 1:] = np.lib.stride_tricks.sliding_window_view(values, period).std(axis=1)
+    return middle, middle + k * std, middle - k * std
+
+
+def true_range(high, low, close):
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    tr = high - low
+    if close.size > 1:
+        previous = close[:-1]
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)])
+    return tr
+
+
+def atr(high, low, close, period=14):
+    """Wilder-smoothed average true range."""
+    return _wilder(true_range(high, low, close), period)
+
+
+def stochastic(high, low, close, k_period=14, d_period=3):
+    """Returns ``(%K, %D)``; %K is 50 when the window has no range."""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    k = np.full(close.size, np.nan)
+    if close.size >= k_period:
+        highest = np.lib.stride_tricks.sliding_window_view(high, k_period).max(axis=1)
+        lowest = np.lib.stride_tricks.sliding_window_view(low, k_period).min(axis=1)
+        span = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k[k_period - 1:] = np.where(span > 0, 100.0 * (close[k_period - 1:] - lowest) / span, 50.0)
+    d = np.full(close.size, np.nan)
+    if close.size >= k_period:
+        d[k_period - 1:] = sma(k[k_period - 1:], d_period)
+    return k, d
+
+
+# ============================
+# Streaming (O(1) per update) forms
+# ============================
+class Indicator:
+    """Base for streaming indicators."""
+
+    value = None
+
+    def reset(self):
+        raise NotImplementedError
+
+    def update(self, *values):
+        raise NotImplementedError
+
+    def seed(self, *arrays):
+        """Rebuild state from history arrays (oldest first)."""
+        self.reset()
+        for row in zip(*(_as_array(a).tolist() for a in arrays)):
+            self.update(*row)
+        return self.value
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+
+class SMA(Indicator):
+    """Simple moving average over a circular buffer with a running sum.
+
+    The sum is recomputed from the buffer every ``resync`` updates to stop
+    floating-point drift.
+    """
+
+    def __init__(self, period, resync=10_000):
+        self.period = period
+        self.resync = resync
+        self.reset()
+
+    def reset(self):
+        self._buffer = [0.0] * self.period
+        self._index = 0
+        self._sum = 0.0
+        self.count = 0
+
+    def update(self, value):
+        i = self._index
+        if self.count >= self.period:
+            self._sum -= self._buffer[i]
+        self._buffer[i] = value
+        self._sum += value
+        self._index = (i + 1) % self.period
+        self.count += 1
+        if self.count % self.resync == 0:
+            self._sum = math.fsum(self._buffer)
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.period:
+            return None
+        return self._sum / self.period
+
+    def window(self):
+        """Buffered values, oldest first."""
+        size = min(self.count, self.period)
+        return [self._buffer[(self._index - size + k) % self.period] for k in range(size)]
+
+    def seed(self, values):
+        values = _as_array(values)
+        self.reset()
+        for value in values[-self.period:].tolist():
+            self.update(value)
+        self.count = int(values.size)
+        return self.value
+
+
+class EMA(Indicator):
+    """EMA seeded with the SMA of the first ``period`` values."""
+
+    def __init__(self, period, alpha=None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.reset()
+
+    def reset(self):
+        self._warmup = 0.0
+        self.count = 0
+        self.value = None
+
+    def update(self, value):
+        self.count += 1
+        if self.value is not None:
+            self.value += self.alpha * (value - self.value)
+        else:
+            self._warmup += value
+            if self.count == self.period:
+                self.value = self._warmup / self.period
+        return self.value
+
+    def seed(self, values):
+        values = _as_array(values)
+        self.reset()
+        if values.size < self.period:
+            for value in values.tolist():
+                self.update(value)
+            return self.value
+        self.count = int(values.size)
+        self.value = float(ema(values, self.period, self.alpha)[-1])
+        return self.value
+
+
+class RSI(Indicator):
+    """RSI updated in O(1) per close.
+
+    ``smoothing="wilder"`` is the standard Wilder-smoothed RSI;
+    ``smoothing="simple"`` averages the last ``period`` changes.
+    """
+
+    def __init__(self, period=14, smoothing="wilder"):
+        if smoothing not in ("wilder", "simple"):
+            raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self._prev = None
+        self._gains = SMA(self.period)
+        self._losses = SMA(self.period)
+        self._avg_gain = None
+        self._avg_loss = None
+
+    @property
+    def value(self):
+        if self.smoothing == "wilder":
+            avg_gain, avg_loss = self._avg_gain, self._avg_loss
+        else:
+            avg_gain, avg_loss = self._gains.value, self._losses.value
+        if avg_gain is None:
+            return None
+        if avg_loss <= 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def update(self, close):
+        close = float(close)
+        if self._prev is None:
+            self._prev = close
+            return None
+
+        change = close - self._prev
+        self._prev = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._gains.update(gain)
+        self._losses.update(loss)
+
+        if self.smoothing == "wilder":
+            if self._avg_gain is not None:
+                self._avg_gain += (gain - self._avg_gain) / self.period
+                self._avg_loss += (loss - self._avg_loss) / self.period
+            elif self._gains.ready:
+                self._avg_gain = self._gains.value
+                self._avg_loss = self._losses.value
+
+        return self.value
+
+    def seed(self, prices):
+        """Rebuild state from a full close history in one vectorized pass."""
+        self.reset()
+        prices = _as_array(prices)
+        if prices.size == 0:
+            return None
+
+        changes = np.diff(prices)
+        gains = np.maximum(changes, 0)
+        losses = np.maximum(-changes, 0)
+        self._prev = float(prices[-1])
+        self._gains.seed(gains)
+        self._losses.seed(losses)
+        if self.smoothing == "wilder" and changes.size >= self.period:
+            self._avg_gain = float(_wilder(gains, self.period)[-1])
+            self._avg_loss = float(_wilder(losses, self.period)[-1])
+        return self.value
+
+
+class MACD(Indicator):
+    """``update`` returns ``(macd, signal, histogram)``; signal and
+    histogram are None until the signal EMA is ready."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.reset()
+
+    def reset(self):
+        self._fast = EMA(self.fast)
+        self._slow = EMA(self.slow)
+        self._signal = EMA(self.signal)
+        self.value = None
+
+    def _snapshot(self, line):
+        signal = self._signal.value
+        return (line, signal, None if signal is None else line - signal)
+
+    def update(self, close):
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if fast is None or slow is None:
+            return None
+        line = fast - slow
+        self._signal.update(line)
+        self.value = self._snapshot(line)
+        return self.value
+
+    def seed(self, closes):
+        closes = _as_array(closes)
+        self.reset()
+        self._fast.seed(closes)
+        self._slow.seed(closes)
+        if closes.size >= self.slow:
+            line = ema(closes, self.fast)[self.slow - 1:] - ema(closes, self.slow)[self.slow - 1:]
+            self._signal.seed(line)
+            self.value = self._snapshot(float(line[-1]))
+        return self.value
+
+
+class Bollinger(Indicator):
+    """``update`` returns ``(middle, upper, lower)``.
+
+    Keeps running sums of values and squares, shifted by the first value
+    seen for precision, and resyncs them every ``resync`` updates.
+    """
+
+    def __init__(self, period=20, k=2.0, resync=10_000):
+        self.period = period
+        self.k = k
+        self.resync = resync
+        self.reset()
+
+    def reset(self):
+        self._buffer = [0.0] * self.period
+        self._index = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._reference = None
+        self.count = 0
+        self.value = None
+
+    def update(self, close):
+        if self._reference is None:
+            self._reference = close
+        x = close - self._reference
+        i = self._index
+        if self.count >= self.period:
+            old = self._buffer[i]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._buffer[i] = x
+        self._sum += x
+        self._sumsq += x * x
+        self._index = (i + 1) % self.period
+        self.count += 1
+        if self.count % self.resync == 0:
+            self._sum = math.fsum(self._buffer)
+            self._sumsq = math.fsum(v * v for v in self._buffer)
+        if self.count < self.period:
+            return None
+        mean = self._sum / self.period
+        std = math.sqrt(max(self._sumsq / self.period - mean * mean, 0.0))
+        middle = mean + self._reference
+        self.value = (middle, middle + self.k * std, middle - self.k * std)
+        return self.value
+
+    def seed(self, closes):
+        closes = _as_array(closes)
+        self.reset()
+        for close in closes[-self.period:].tolist():
+            self.update(close)
+        self.count = int(closes.size)
+        return self.value
+
+
+class ATR(Indicator):
+    """Wilder-smoothed average true range; ``update(high, low, close)``."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self._prev_close = None
+        self._warmup = 0.0
+        self.count = 0
+        self.value = None
+
+    def update(self, high, low, close):
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.count += 1
+        if self.value is not None:
+            self.value += (tr - self.value) / self.period
+        else:
+            self._warmup += tr
+            if self.count == self.period:
+                self.value = self._warmup / self.period
+        return self.value
+
+    def seed(self, highs, lows, closes):
+        highs, lows, closes = _as_array(highs), _as_array(lows), _as_array(closes)
+        if closes.size < self.period:
+            return super().seed(highs, lows, closes)
+        self.reset()
+        self._prev_close = float(closes[-1])
+        self.count = int(closes.size)
+        self.value = float(atr(highs, lows, closes, self.period)[-1])
+        return self.value
+
+
+class Stochastic(Indicator):
+    """``update(high, low, close)`` returns ``(%K, %D)``; %D is None until
+    ``d_period`` %K values exist. Window extremes use monotonic deques."""
+
+    def __init__(self, k_period=14, d_period=3):
+        self.k_period = k_period
+        self.d_period = d_period
+        self.reset()
+
+    def reset(self):
+        self._highs = deque()
+        self._lows = deque()
+        self._d = SMA(self.d_period)
+        self.count = 0
+        self.value = None
+
+    def update(self, high, low, close):
+        i = self.count
+        self.count += 1
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((i, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((i, low))
+        oldest = i - self.k_period + 1
+        if self._highs[0][0] < oldest:
+            self._highs.popleft()
+        if self._lows[0][0] < oldest:
+            self._lows.popleft()
+        if self.count < self.k_period:
+            return None
+        highest = self._highs[0][1]
+        lowest = self._lows[0][1]
+        span = highest - lowest
+        k = 100.0 * (close - lowest) / span if span > 0 else 50.0
+        self.value = (k, self._d.update(k))
+        return self.value
+
+    def seed(self, highs, lows, closes):
+        # Only the last k_period + d_period - 1 bars affect the state.
+        highs, lows, closes = _as_array(highs), _as_array(lows), _as_array(closes)
+        tail = self.k_period + self.d_period - 1
+        self.reset()
+        self.count = max(0, closes.size - tail)
+        for row in zip(highs[-tail:].tolist(), lows[-tail:].tolist(), closes[-tail:].tolist()):
+            self.update(*row)
+        return self.value
+
+
+# ============================
+# Per-pair bundle
+# ============================
+class IndicatorSet:
+    """The standard indicators for one pair, each updated once per bar.
+
+    ``update`` returns a snapshot dict that signal rules can share instead
+    of recomputing anything.
+    """
+
+    def __init__(self):
+        self.sma = SMA(20)
+        self.ema = EMA(20)
+        self.rsi = RSI(14)
+        self.macd = MACD()
+        self.bollinger = Bollinger()
+        self.atr = ATR()
+        self.stochastic = Stochastic()
+
+    def update(self, high, low, close):
+        self.sma.update(close)
+        self.ema.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.atr.update(high, low, close)
+        self.stochastic.update(high, low, close)
+        return self.snapshot()
+
+    def seed(self, highs, lows, closes):
+        self.sma.seed(closes)
+        self.ema.seed(closes)
+        self.rsi.seed(closes)
+        self.macd.seed(closes)
+        self.bollinger.seed(closes)
+        self.atr.seed(highs, lows, closes)
+        self.stochastic.seed(highs, lows, closes)
+        return self.snapshot()
+
+    def snapshot(self):
+        macd = self.macd.value or (None, None, None)
+        bands = self.bollinger.value or (None, None, None)
+        stochastic = self.stochastic.value or (None, None)
+        return {
+            "sma": self.sma.value,
+            "ema": self.ema.value,
+            "rsi": self.rsi.value,
+            "macd": macd[0],
+            "macd_signal": macd[1],
+            "macd_hist": macd[2],
+            "bb_middle": bands[0],
+            "bb_upper": bands[1],
+            "bb_lower": bands[2],
+            "atr": self.atr.value,
+            "stoch_k": stochastic[0],
+            "stoch_d": stochastic[1],
+        }
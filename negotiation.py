@@ -0,0 +1,19 @@
+def parse_accept(header):
+    """``(value, q)`` pairs of an Accept or Accept-Encoding header, in order.
+
+    Values are lower-cased; a malformed ``q`` counts as 0.
+    """
+    ranges = []
+    for item in (header or "").split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((value.lower(), q))
+    return ranges
@@ -0,0 +1,188 @@
+import csv
+import numpy as np
+from fetcher import fetch_prices
+from ratelimit import TokenBucket
+from store import Bar, parse_datetime_ms
+from config import (
+    MARKET_DATA_PROVIDER,
+    POLL_CONCURRENCY,
+    POLL_INTERVAL,
+    REPLAY_FILE,
+    SYNTHETIC_SEED,
+    SYNTHETIC_VOLATILITY,
+    TWELVEDATA_CREDITS_PER_MINUTE,
+)
+
+
+class MarketDataProvider:
+    """Source of bars for the backend poller.
+
+    ``latest`` is called once per tick with every pair and the tick time
+    (epoch ms), and returns ``{pair: Bar or None}`` with the most recent
+    closed bar of each pair. ``history`` returns up to ``count`` closed
+    bars per pair, oldest first, for the startup backfill; providers
+    without history return nothing.
+    """
+
+    name = "base"
+
+    def __init__(self, interval_ms: int = int(POLL_INTERVAL * 1000)):
+        self.interval_ms = interval_ms
+
+    def bar_start(self, now_ms: int) -> int:
+        """Open time of the last bar that has fully closed by ``now_ms``."""
+        return (now_ms // self.interval_ms - 1) * self.interval_ms
+
+    async def latest(self, pairs, now_ms: int):
+        raise NotImplementedError
+
+    async def history(self, pairs, count: int, now_ms: int):
+        return {}
+
+
+class TwelveDataProvider(MarketDataProvider):
+    """Real 1-minute bars from TwelveData, batched and credit-limited."""
+
+    name = "twelvedata"
+
+    def __init__(self, credits_per_minute=TWELVEDATA_CREDITS_PER_MINUTE, concurrency=POLL_CONCURRENCY,
+                 interval_ms=60_000):
+        super().__init__(interval_ms)
+        self.limiter = TokenBucket(credits_per_minute, per=60)
+        self.concurrency = concurrency
+
+    async def latest(self, pairs, now_ms: int):
+        # The newest TwelveData bar is still forming; ask for two and keep
+        # the newest one that has closed.
+        results = await fetch_prices(pairs, outputsize=2, limiter=self.limiter, concurrency=self.concurrency)
+        latest = {}
+        for pair, result in results.items():
+            latest[pair] = None
+            if result.ok:
+                latest[pair] = next(
+                    (bar for bar in result.values if bar.timestamp + self.interval_ms <= now_ms),
+                    None
+                )
+        return latest
+
+    async def history(self, pairs, count: int, now_ms: int):
+        results = await fetch_prices(pairs, outputsize=count + 1, limiter=self.limiter, concurrency=self.concurrency)
+        return {
+            pair: [bar for bar in reversed(result.values) if bar.timestamp + self.interval_ms <= now_ms][-count:]
+            for pair, result in results.items()
+            if result.ok
+        }
+
+
+class SyntheticProvider(MarketDataProvider):
+    """Deterministic geometric random walk, for offline runs and load tests.
+
+    Every pair starts at ``start_price``; each tick draws all pairs'
+    returns in one vectorized step. The same ``seed`` and pair list give
+    the same series.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, volatility=SYNTHETIC_VOLATILITY, seed=SYNTHETIC_SEED, start_price=1.15, **kwargs):
+        super().__init__(**kwargs)
+        self.volatility = volatility
+        self.start_price = start_price
+        self._rng = np.random.default_rng(seed)
+        self._last = {}
+
+    def _walk(self, previous, steps):
+        """``steps`` bars for every pair at once; arrays are (steps, pairs)."""
+        shape = (steps, previous.size)
+        closes = previous * np.exp(np.cumsum(self._rng.normal(0.0, self.volatility, shape), axis=0))
+        opens = np.vstack([previous[np.newaxis], closes[:-1]])
+        wicks = np.abs(self._rng.normal(0.0, self.volatility / 2, (2,) + shape))
+        highs = np.maximum(opens, closes) * (1 + wicks[0])
+        lows = np.minimum(opens, closes) * (1 - wicks[1])
+        volumes = self._rng.integers(100, 10_000, shape).astype(np.float64)
+        return [np.round(a, 5) for a in (opens, highs, lows, closes)] + [volumes]
+
+    def _step(self, previous):
+        return [a[0].tolist() for a in self._walk(previous, 1)]
+
+    async def latest(self, pairs, now_ms: int):
+        timestamp = self.bar_start(now_ms)
+        previous = np.array([self._last.get(pair, self.start_price) for pair in pairs], dtype=np.float64)
+        opens, highs, lows, closes, volumes = self._step(previous)
+        latest = {}
+        for i, pair in enumerate(pairs):
+            latest[pair] = Bar(timestamp, opens[i], highs[i], lows[i], closes[i], volumes[i])
+            self._last[pair] = closes[i]
+        return latest
+
+    async def history(self, pairs, count: int, now_ms: int):
+        end = self.bar_start(now_ms)
+        timestamps = [end - (count - 1 - i) * self.interval_ms for i in range(count)]
+        previous = np.array([self._last.get(pair, self.start_price) for pair in pairs], dtype=np.float64)
+        opens, highs, lows, closes, volumes = (a.T.tolist() for a in self._walk(previous, count))
+        history = {}
+        for i, pair in enumerate(pairs):
+            history[pair] = [Bar(*row) for row in zip(timestamps, opens[i], highs[i], lows[i], closes[i], volumes[i])]
+            self._last[pair] = closes[i][-1]
+        return history
+
+
+class ReplayProvider(MarketDataProvider):
+    """Plays back recorded bars, one per pair per tick, in time order.
+
+    Pairs whose recording is exhausted (or missing) return None.
+    """
+
+    name = "replay"
+
+    def __init__(self, bars, **kwargs):
+        super().__init__(**kwargs)
+        self.bars = {pair: sorted(series, key=lambda bar: bar.timestamp) for pair, series in bars.items()}
+        self._positions = {}
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        """Load a CSV with ``symbol``, ``datetime`` (UTC) or ``timestamp``
+        (epoch ms), ``open``, ``high``, ``low``, ``close`` and optional
+        ``volume`` columns."""
+        bars = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("timestamp"):
+                    timestamp = int(row["timestamp"])
+                else:
+                    timestamp = parse_datetime_ms(row["datetime"])
+                bars.setdefault(row["symbol"], []).append(Bar(
+                    timestamp,
+                    float(row["open"]),
+                    float(row["high"]),
+                    float(row["low"]),
+                    float(row["close"]),
+                    float(row.get("volume") or 0.0),
+                ))
+        return cls(bars, **kwargs)
+
+    async def latest(self, pairs, now_ms: int):
+        latest = {}
+        for pair in pairs:
+            series = self.bars.get(pair, [])
+            position = self._positions.get(pair, 0)
+            if position >= len(series):
+                latest[pair] = None
+                continue
+            latest[pair] = series[position]
+            self._positions[pair] = position + 1
+        return latest
+
+
+def make_provider(name=MARKET_DATA_PROVIDER):
+    """Build the provider selected by ``MARKET_DATA_PROVIDER``."""
+    if name == "twelvedata":
+        return TwelveDataProvider()
+    if name == "synthetic":
+        return SyntheticProvider()
+    if name == "replay":
+        if not REPLAY_FILE:
+            raise ValueError("MARKET_DATA_PROVIDER=replay needs REPLAY_FILE")
+        return ReplayProvider.from_csv(REPLAY_FILE)
+    raise ValueError(f"Unknown market data provider: {name}")
@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket allowing ``rate`` tokens per ``per`` seconds.
+
+    Up to ``capacity`` tokens (default: ``rate``) can be spent in a burst.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: float = None):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    @property
+    def available(self):
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, tokens: float = 1):
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) * self.per / self.rate)
@@ -0,0 +1,63 @@
+import hashlib
+from aiohttp import web
+from compression import compress, strip_encoding
+
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def etag_matches(header, etag):
+    """True if an If-None-Match header value matches ``etag``."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if strip_encoding(candidate) == etag:
+            return True
+    return False
+
+
+class CachedResponse:
+    """A response body encoded once and served many times, with an ETag.
+
+    Compressed copies are made on first use and kept with the body.
+    """
+
+    __slots__ = ("body", "etag", "content_type", "headers", "_compressed")
+
+    def __init__(self, body: bytes, content_type: str = "application/json", headers=None):
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+        self._compressed = {}
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+    @classmethod
+    def json(cls, obj):
+        return cls(dumps(obj))
+
+    def compressed(self, encoding) -> bytes:
+        if encoding not in self._compressed:
+            self._compressed[encoding] = compress(encoding, self.body)
+        return self._compressed[encoding]
+
+    def respond(self, request) -> web.Response:
+        headers = {**self.headers, "ETag": self.etag}
+        if etag_matches(request.headers.get("If-None-Match"), self.etag):
+            response = web.Response(status=304, headers=headers)
+        else:
+            response = web.Response(body=self.body, content_type=self.content_type, headers=headers)
+        response["cached"] = self
+        return response
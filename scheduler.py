@@ -0,0 +1,72 @@
+import asyncio
+import math
+import time
+
+
+class Ticker:
+    """Fires on wall-clock boundaries of ``interval`` seconds plus ``offset``.
+
+    Deadlines are tracked on the monotonic clock so they never drift with the
+    work done between ticks. If a tick is overrun, the missed boundaries are
+    skipped and counted instead of firing back to back.
+    """
+
+    def __init__(self, interval: float = 60.0, offset: float = 0.0):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.offset = offset % interval
+        self.ticks = 0
+        self.missed = 0
+        self.last_lag = None
+        self.max_lag = 0.0
+        self._deadline = None
+        self._boundary = None
+
+    def _align(self):
+        wall = time.time()
+        mono = time.monotonic()
+        boundary = (math.floor((wall - self.offset) / self.interval) + 1) * self.interval + self.offset
+        self._boundary = boundary
+        self._deadline = mono + (boundary - wall)
+
+    async def wait(self) -> float:
+        """Sleep until the next boundary and return its wall-clock epoch."""
+        if self._deadline is None:
+            self._align()
+        else:
+            self._deadline += self.interval
+            self._boundary += self.interval
+
+        now = time.monotonic()
+        if now > self._deadline + self.interval:
+            skipped = int((now - self._deadline) // self.interval)
+            self._deadline += skipped * self.interval
+            self._boundary += skipped * self.interval
+            self.missed += skipped
+
+        delay = self._deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        lag = max(0.0, time.monotonic() - self._deadline)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.ticks += 1
+        return self._boundary
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.wait()
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "offset": self.offset,
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "last_lag_ms": None if self.last_lag is None else round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
@@ -1,34 +1,51 @@
 import numpy as np
+import indicators
 from datetime import datetime
 from config import NIGERIA_TZ
 
-def calc_rsi(prices, period=14):
-    if len(prices) < period + 1:
-        return None
+class RSI(indicators.RSI):
+    """Per-pair RSI from ``indicators``, reported to two decimals."""
 
-    changes = np.diff(prices)
-    gains = np.maximum(changes, 0)
-    losses = np.maximum(-changes, 0)
+    @property
+    def value(self):
+        value = super().value
+        return None if value is None else round(value, 2)
 
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
 
-    if avg_loss == 0:
-        return 100
+def calc_rsi(prices, period=14, smoothing="simple"):
+    rsi = RSI(period, smoothing)
+    return rsi.seed(prices)
 
-    rs = avg_gain / avg_loss
-    return round(100 - (100 / (1 + rs)), 2)
+def as_closes(history):
+    """Return closes as a float64 array.
 
-def sniper_signal(history):
-    """Generate sniper BUY/SELL signals based on RSI + momentum."""
+    Accepts a ``PriceHistory``, a float64 array of closes, a structured
+    array with a ``close`` field, or the legacy list of bar dicts.
+    """
+    if hasattr(history, "closes"):
+        return history.closes()
+    if isinstance(history, np.ndarray):
+        if history.dtype.names:
+            return history["close"]
+        return history.astype(np.float64, copy=False)
+    return np.fromiter((float(x["close"]) for x in history), dtype=np.float64, count=len(history))
+
+
+def sniper_signal(history, rsi=None):
+    """Generate sniper BUY/SELL signals based on RSI + momentum.
+
+    ``history`` is anything ``as_closes`` understands. ``rsi`` may be passed
+    in from a per-pair ``RSI`` tracker to skip recomputing it.
+    """
     if len(history) < 20:
         return {"signal": "WAIT", "confidence": 0}
 
-    closes = [float(x["close"]) for x in history]
+    closes = as_closes(history)
 
-    rsi = calc_rsi(closes)
-    last_close = closes[-1]
-    prev_close = closes[-2]
+    if rsi is None:
+        rsi = calc_rsi(closes)
+    last_close = float(closes[-1])
+    prev_close = float(closes[-2])
 
     direction = "UP" if last_close > prev_close else "DOWN"
 
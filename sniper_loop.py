@@ -1,6 +1,9 @@
 import os
+import time
 import asyncio
 import aiohttp
+from config import PAIRS
+from telegram import TelegramOutbox
 from datetime import datetime, timezone, timedelta
 
 # ============================
@@ -14,49 +17,102 @@ NIGERIA_TZ = timezone(timedelta(hours=1))
 BACKEND_URL = os.environ.get("BACKEND_URL", f"http://127.0.0.1:{os.environ.get('PORT', 8080)}")
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID")
+# Re-send an unchanged signal after this many seconds (0 = only on changes)
+SIGNAL_HEARTBEAT = float(os.environ.get("SIGNAL_HEARTBEAT", 0))
+# Per-request timeout in seconds
+FETCH_TIMEOUT = float(os.environ.get("SNIPER_FETCH_TIMEOUT", 5))
 
 # ============================
-# Telegram sender
+# Fetch signals from backend
 # ============================
-async def send_telegram_message(message):
-    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
-        print("Telegram not configured.")
-        return
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    async with aiohttp.ClientSession() as session:
-        await session.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": message})
-
-# ============================
-# Fetch signal from backend
-# ============================
-async def fetch_signal(session, pair):
+async def fetch_all_signals(session, pairs, since=None, timeout=FETCH_TIMEOUT):
+    """Fetch every pair's signal in one /signals request."""
+    params = {"pairs": ",".join(pairs)}
+    if since is not None:
+        params["since"] = str(since)
     try:
-        async with session.get(f"{BACKEND_URL}/signal?pair={pair}") as resp:
+        async with session.get(
+            f"{BACKEND_URL}/signals",
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as resp:
             if resp.status == 200:
                 data = await resp.json()
-                return data
+                return data["signals"]
             else:
-                print(f"Failed fetching {pair}: {resp.status}")
-                return None
+                print(f"Failed fetching signals: {resp.status}")
+                return []
+    except asyncio.TimeoutError:
+        print("Timed out fetching signals")
+        return []
     except Exception as e:
-        print(f"Error fetching {pair}: {e}")
-        return None
+        print(f"Error fetching signals: {e}")
+        return []
+
+def format_signal(signal):
+    return f"Sent signal: {signal['pair']} – {signal['signal']}"
+
+# ============================
+# Dispatcher: only alert on signal changes
+# ============================
+class SignalDispatcher:
+    """Sends a pair's signal only when it differs from the last one sent.
+
+    With ``heartbeat`` > 0, an unchanged signal is re-sent once the last
+    alert for that pair is ``heartbeat`` seconds old. Alerts are handed to a
+    ``TelegramOutbox`` and never block the caller.
+    """
+
+    def __init__(self, outbox, heartbeat=SIGNAL_HEARTBEAT):
+        self.outbox = outbox
+        self.heartbeat = heartbeat
+        self._last = {}
+
+    def should_send(self, signal):
+        last = self._last.get(signal["pair"])
+        if last is None or last[0] != signal["signal"]:
+            return True
+        return self.heartbeat > 0 and time.monotonic() - last[1] >= self.heartbeat
+
+    def dispatch(self, signal):
+        if not signal or not self.should_send(signal):
+            return False
+        msg = format_signal(signal)
+        print(msg)
+        self.outbox.send(msg)
+        self._last[signal["pair"]] = (signal["signal"], time.monotonic())
+        return True
+
+# ============================
+# In-process mode: subscribe to backend's signal bus
+# ============================
+async def run_inprocess(bus, pairs=None):
+    """Send alerts straight from a ``bus.SignalBus`` inside backend.py's loop."""
+    print("Starting SNIPER loop in-process (Nigeria Time UTC+1)...")
+    subscription = bus.subscribe(pairs, maxsize=0)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with TelegramOutbox(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, session) as outbox:
+                dispatcher = SignalDispatcher(outbox)
+                async for event in subscription:
+                    dispatcher.dispatch(event.data)
+    finally:
+        subscription.close()
 
 # ============================
 # Main SNIPER loop
 # ============================
-async def main():
-    pairs = ["EUR/USD", "AUD/USD"]
+async def main(pairs=PAIRS):
     print(f"Starting SNIPER loop (Nigeria Time UTC+1)...")
+    since = None
     async with aiohttp.ClientSession() as session:
-        while True:
-            for pair in pairs:
-                signal = await fetch_signal(session, pair)
-                if signal:
-                    msg = f"Sent signal: {signal['pair']} – {signal['signal']}"
-                    print(msg)
-                    await send_telegram_message(msg)
-            await asyncio.sleep(60)  # Repeat every 60 seconds
+        async with TelegramOutbox(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, session) as outbox:
+            dispatcher = SignalDispatcher(outbox)
+            while True:
+                for signal in await fetch_all_signals(session, pairs, since):
+                    dispatcher.dispatch(signal)
+                    since = max(since or 0, signal.get("updated", 0))
+                await asyncio.sleep(60)  # Repeat every 60 seconds
 
 if __name__ == "__main__":
     asyncio.run(main())
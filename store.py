@@ -0,0 +1,176 @@
+import numpy as np
+from datetime import datetime, timezone
+from config import MAX_HISTORY, NIGERIA_TZ
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def format_epoch_ms(ts: int) -> str:
+    return datetime.fromtimestamp(ts / 1000, NIGERIA_TZ).strftime(DATETIME_FORMAT)
+
+
+def parse_datetime_ms(value: str, tz=timezone.utc) -> int:
+    """Epoch ms for a TwelveData ``datetime`` string given in ``tz``."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    return to_epoch_ms(dt)
+
+
+class Bar:
+    """One OHLCV bar with an epoch-ms timestamp."""
+
+    __slots__ = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timestamp: int, open: float, high: float, low: float, close: float, volume: float = 0.0):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_twelvedata(cls, values: dict, tz=timezone.utc):
+        """Parse one TwelveData ``values`` entry (strings) into a Bar.
+
+        Forex series have no volume; it is stored as 0.
+        """
+        return cls(
+            parse_datetime_ms(values["datetime"], tz),
+            float(values["open"]),
+            float(values["high"]),
+            float(values["low"]),
+            float(values["close"]),
+            float(values.get("volume") or 0.0),
+        )
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Bar({fields})"
+
+
+class PriceHistory:
+    """Fixed-capacity ring buffer of bars for one pair.
+
+    Every column is allocated at twice the capacity and each value is written
+    to both halves, so the latest ``n`` bars are always one contiguous slice
+    and can be returned as a NumPy view without copying.
+    """
+
+    FIELDS = Bar.__slots__
+
+    def __init__(self, capacity: int = MAX_HISTORY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._columns = {
+            name: np.zeros(2 * capacity, dtype=np.int64 if name == "timestamp" else np.float64)
+            for name in self.FIELDS
+        }
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, bar: Bar):
+        """Store one bar in O(1), overwriting the oldest once full."""
+        i = self._head
+        j = i + self.capacity
+        for name, value in zip(self.FIELDS, bar):
+            column = self._columns[name]
+            column[i] = value
+            column[j] = value
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, bars):
+        """Store many bars (oldest first) with one vectorized write per column."""
+        rows = [tuple(bar) for bar in list(bars)[-self.capacity:]]
+        k = len(rows)
+        if not k:
+            return
+        positions = (self._head + np.arange(k)) % self.capacity
+        for index, name in enumerate(self.FIELDS):
+            column = self._columns[name]
+            values = np.fromiter((row[index] for row in rows), dtype=column.dtype, count=k)
+            column[positions] = values
+            column[positions + self.capacity] = values
+        self._head = (self._head + k) % self.capacity
+        self._size = min(self._size + k, self.capacity)
+
+    def _bounds(self, n=None):
+        size = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self.capacity
+        return end - size, end
+
+    def column(self, name: str, n=None) -> np.ndarray:
+        """Read-only view of the latest ``n`` values (oldest first)."""
+        start, end = self._bounds(n)
+        view = self._columns[name][start:end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n=None):
+        return self.column("timestamp", n)
+
+    def opens(self, n=None):
+        return self.column("open", n)
+
+    def highs(self, n=None):
+        return self.column("high", n)
+
+    def lows(self, n=None):
+        return self.column("low", n)
+
+    def closes(self, n=None):
+        return self.column("close", n)
+
+    def volumes(self, n=None):
+        return self.column("volume", n)
+
+    def search(self, since=None, until=None):
+        """Binary-search the timestamp index for bars in ``[since, until]``.
+
+        Returns ``(lo, hi)`` positions into the current history (oldest is
+        0), suitable for ``records`` and ``window``.
+        """
+        timestamps = self.timestamps()
+        lo = 0 if since is None else int(np.searchsorted(timestamps, since, side="left"))
+        hi = len(timestamps) if until is None else int(np.searchsorted(timestamps, until, side="right"))
+        return lo, max(lo, hi)
+
+    def window(self, name: str, lo: int, hi: int) -> np.ndarray:
+        """Read-only view of positions ``lo:hi`` of one column."""
+        start, _ = self._bounds()
+        view = self._columns[name][start + lo:start + hi]
+        view.flags.writeable = False
+        return view
+
+    def last(self):
+        """Latest bar, or None when empty."""
+        if not self._size:
+            return None
+        return Bar(*(self.window(name, self._size - 1, self._size)[0].item() for name in self.FIELDS))
+
+    def to_records(self, n=None):
+        """Latest ``n`` bars as JSON-ready dicts (oldest first)."""
+        size = self._size if n is None else max(0, min(n, self._size))
+        return self.records(self._size - size, self._size)
+
+    def records(self, lo: int, hi: int):
+        """Bars at positions ``lo:hi`` as JSON-ready dicts (oldest first)."""
+        columns = [self.window(name, lo, hi).tolist() for name in self.FIELDS]
+        return [
+            {"datetime": format_epoch_ms(ts), "timestamp": ts, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for ts, o, h, l, c, v in zip(*columns)
+        ]
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import aiohttp
+from ratelimit import TokenBucket
+
+API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+
+# Telegram Bot API limits
+MAX_MESSAGE_LENGTH = 4096
+GLOBAL_RATE = 30  # messages per second across all chats
+CHAT_RATE = 1  # messages per second to one chat
+
+logger = logging.getLogger("telegram")
+
+
+def coalesce(texts, limit=MAX_MESSAGE_LENGTH):
+    """Join texts with newlines into as few messages of at most ``limit`` chars."""
+    messages = []
+    current = ""
+    for text in texts:
+        while len(text) > limit:
+            if current:
+                messages.append(current)
+                current = ""
+            messages.append(text[:limit])
+            text = text[limit:]
+        if not current:
+            current = text
+        elif len(current) + 1 + len(text) <= limit:
+            current = f"{current}\n{text}"
+        else:
+            messages.append(current)
+            current = text
+    if current:
+        messages.append(current)
+    return messages
+
+
+class TelegramOutbox:
+    """Asynchronous, rate-limited Telegram sender.
+
+    ``send`` only enqueues. Each chat has a worker that waits ``linger``
+    seconds to gather the rest of a burst, merges everything queued into as
+    few messages as possible, and delivers them under the per-chat and
+    global rate limits. A 429 is retried after the ``retry_after`` Telegram
+    asks for; network and server errors are retried with exponential
+    backoff up to ``max_attempts`` times.
+    """
+
+    def __init__(self, token, chat_id, session, linger=0.2, max_attempts=5,
+                 backoff=1.0, max_backoff=30.0, global_rate=GLOBAL_RATE, chat_rate=CHAT_RATE):
+        self.token = token
+        self.chat_id = chat_id
+        self.session = session
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.chat_rate = chat_rate
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self._global = TokenBucket(global_rate, per=1.0)
+        self._queues = {}
+        self._workers = {}
+        self._warned = False
+
+    @property
+    def configured(self):
+        return bool(self.token and self.chat_id)
+
+    def send(self, text, chat_id=None):
+        """Queue ``text`` for delivery to ``chat_id`` (default chat if omitted)."""
+        chat_id = chat_id or self.chat_id
+        if not self.token or not chat_id:
+            if not self._warned:
+                logger.warning("Telegram not configured; alerts are dropped")
+                self._warned = True
+            return
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+            self._workers[chat_id] = asyncio.create_task(self._worker(chat_id, queue))
+        queue.put_nowait(text)
+
+    async def _worker(self, chat_id, queue):
+        chat_bucket = TokenBucket(self.chat_rate, per=1.0, capacity=1)
+        while True:
+            texts = [await queue.get()]
+            if self.linger:
+                await asyncio.sleep(self.linger)
+            while not queue.empty():
+                texts.append(queue.get_nowait())
+            try:
+                messages = coalesce(texts)
+                self.coalesced += len(texts) - len(messages)
+                for message in messages:
+                    await chat_bucket.acquire()
+                    await self._global.acquire()
+                    try:
+                        delivered = await self._deliver(chat_id, message)
+                    except Exception:
+                        # One bad response must not stop this chat's worker.
+                        logger.exception(f"Telegram delivery to {chat_id} crashed")
+                        delivered = False
+                    if delivered:
+                        self.sent += 1
+                    else:
+                        self.failed += 1
+            finally:
+                for _ in texts:
+                    queue.task_done()
+
+    async def _deliver(self, chat_id, text):
+        url = API_URL.format(token=self.token)
+        data = {"chat_id": chat_id, "text": text}
+        for attempt in range(1, self.max_attempts + 1):
+            delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+            try:
+                async with self.session.post(url, data=data) as resp:
+                    payload = await resp.json(content_type=None)
+                if not isinstance(payload, dict):
+                    # Empty or malformed body: retry like a server error.
+                    logger.warning(f"Telegram send to {chat_id} got no valid body ({resp.status}), retry in {delay}s")
+                elif resp.status == 200 and payload.get("ok"):
+                    return True
+                elif resp.status == 429:
+                    parameters = payload.get("parameters")
+                    if isinstance(parameters, dict):
+                        delay = parameters.get("retry_after", delay)
+                    logger.warning(f"Telegram send to {chat_id} rate limited, retry in {delay}s")
+                elif 400 <= resp.status < 500:
+                    logger.error(f"Telegram rejected message to {chat_id}: {payload}")
+                    return False
+                else:
+                    logger.warning(f"Telegram send to {chat_id} failed ({resp.status}), retry in {delay}s")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Telegram send to {chat_id} failed ({e!r}), retry in {delay}s")
+            if attempt < self.max_attempts:
+                await asyncio.sleep(delay)
+        logger.error(f"Giving up on Telegram message to {chat_id} after {self.max_attempts} attempts")
+        return False
+
+    async def flush(self):
+        """Wait until everything queued so far has been delivered or given up."""
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    async def close(self, timeout=10.0):
+        """Flush pending messages (up to ``timeout`` seconds) and stop the workers."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Telegram outbox closed with undelivered messages")
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,57 @@
+import asyncio
+
+from bus import SignalBus
+
+
+def test_explicit_subscription_subscribe_and_unsubscribe():
+    subscription = SignalBus().subscribe(["EUR/USD"])
+    assert subscription.wants("EUR/USD")
+    assert not subscription.wants("AUD/USD")
+
+    subscription.subscribe(["AUD/USD"])
+    assert subscription.wants("AUD/USD")
+
+    subscription.unsubscribe(["EUR/USD"])
+    assert not subscription.wants("EUR/USD")
+    assert subscription.wants("AUD/USD")
+
+
+def test_all_pairs_unsubscribe_keeps_other_pairs():
+    subscription = SignalBus().subscribe(None)
+    subscription.unsubscribe(["EUR/USD"])
+    assert not subscription.wants("EUR/USD")
+    assert subscription.wants("AUD/USD")
+    assert subscription.wants("GBP/USD")
+
+    subscription.subscribe(["EUR/USD"])
+    assert subscription.wants("EUR/USD")
+
+
+def test_publish_filters_by_pair():
+    async def run():
+        bus = SignalBus()
+        everything = bus.subscribe()
+        eur_only = bus.subscribe(["EUR/USD"])
+        everything.unsubscribe(["EUR/USD"])
+        bus.publish("EUR/USD", {"pair": "EUR/USD"})
+        bus.publish("AUD/USD", {"pair": "AUD/USD"})
+        assert [everything.queue.get_nowait().pair] == ["AUD/USD"]
+        assert [eur_only.queue.get_nowait().pair] == ["EUR/USD"]
+        assert everything.queue.empty() and eur_only.queue.empty()
+
+    asyncio.run(run())
+
+
+def test_full_subscriber_is_dropped_and_closed():
+    async def run():
+        bus = SignalBus(maxsize=1)
+        slow = bus.subscribe()
+        unbounded = bus.subscribe(maxsize=0)
+        for i in range(3):
+            bus.publish("EUR/USD", {"i": i})
+        assert bus.dropped == 1
+        assert slow.closed and len(bus) == 1
+        assert await slow.get() is None
+        assert [(await unbounded.get()).data["i"] for _ in range(3)] == [0, 1, 2]
+
+    asyncio.run(run())
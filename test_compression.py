@@ -0,0 +1,107 @@
+import asyncio
+import gzip
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from compression import CODECS, compression_middleware, negotiate_encoding, strip_encoding
+from responses import CachedResponse
+
+BIG = CachedResponse.json({"values": list(range(2000))})
+SMALL = CachedResponse.json({"ok": True})
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0.5, zstd;q=0.9", "zstd"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "zstd"),
+    ("*, zstd;q=0, br;q=0", "gzip"),
+    ("*, gzip;q=0", next((c for c in CODECS if c != "gzip"), None)),
+    ("br;q=bogus, gzip", "gzip"),
+])
+def test_negotiate_encoding(header, expected):
+    if expected is not None and expected not in CODECS:
+        pytest.skip(f"{expected} is not installed")
+    assert negotiate_encoding(header) == expected
+
+
+def test_strip_encoding():
+    assert strip_encoding('"abc-gzip"') == '"abc"'
+    for coding in CODECS:
+        assert strip_encoding(f'"abc-{coding}"') == '"abc"'
+    assert strip_encoding('"abc"') == '"abc"'
+
+
+def run_app(check):
+    async def big(request):
+        return BIG.respond(request)
+
+    async def small(request):
+        return SMALL.respond(request)
+
+    async def plain(request):
+        return web.Response(body=b"x" * 5000, headers={"ETag": '"plain"'})
+
+    async def run():
+        app = web.Application(middlewares=[compression_middleware(min_size=1024)])
+        app.add_routes([web.get("/big", big), web.get("/small", small), web.get("/plain", plain)])
+        async with TestClient(TestServer(app)) as client:
+            await check(client)
+
+    asyncio.run(run())
+
+
+def test_compresses_with_suffixed_etag_and_reuses_cached_copy():
+    async def check(client):
+        response = await client.get("/big", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        body = await response.read()
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == f'{BIG.etag[:-1]}-gzip"'
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert gzip.decompress(body) == BIG.body
+        assert body == BIG.compressed("gzip")
+
+    run_app(check)
+
+
+def test_304_keeps_the_variant_etag():
+    async def check(client):
+        gzip_etag = f'{BIG.etag[:-1]}-gzip"'
+        response = await client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        assert response.status == 304
+        assert response.headers["ETag"] == gzip_etag
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+        # Same content, other coding: the unencoded ETag still validates
+        response = await client.get("/big", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+        assert response.status == 304
+        assert response.headers["ETag"] == BIG.etag
+
+    run_app(check)
+
+
+def test_small_and_unencoded_responses_pass_through():
+    async def check(client):
+        response = await client.get("/small", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["ETag"] == SMALL.etag
+
+        response = await client.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert await response.read() == BIG.body
+
+    run_app(check)
+
+
+def test_compresses_uncached_responses():
+    async def check(client):
+        response = await client.get("/plain", headers={"Accept-Encoding": "gzip"}, auto_decompress=False)
+        assert gzip.decompress(await response.read()) == b"x" * 5000
+        assert response.headers["ETag"] == '"plain-gzip"'
+
+    run_app(check)
@@ -0,0 +1,51 @@
+from fetcher import chunked, parse_batch
+
+
+def series(*closes):
+    return {
+        "status": "ok",
+        "values": [
+            {"datetime": f"2024-01-01 00:0{i}:00", "open": "1.0", "high": "1.2", "low": "0.9", "close": close}
+            for i, close in enumerate(closes)
+        ],
+    }
+
+
+def test_single_symbol_gets_flat_series():
+    results = parse_batch(["EUR/USD"], series("1.1", "1.05"))
+    result = results["EUR/USD"]
+    assert result.ok
+    assert [bar.close for bar in result.values] == [1.1, 1.05]
+    assert result.values[0].timestamp == 1704067200000  # parsed as UTC
+    assert result.values[0].volume == 0.0
+
+
+def test_multi_symbol_splits_by_key_with_per_symbol_errors():
+    data = {
+        "EUR/USD": series("1.1"),
+        "BAD/SYM": {"status": "error", "code": 400, "message": "symbol not found"},
+    }
+    results = parse_batch(["EUR/USD", "BAD/SYM", "GBP/USD"], data)
+    assert results["EUR/USD"].ok
+    assert results["BAD/SYM"].error == "symbol not found"
+    assert results["GBP/USD"].error == "Missing from response"
+
+
+def test_whole_request_error_fails_every_symbol():
+    data = {"status": "error", "code": 429, "message": "out of credits"}
+    results = parse_batch(["EUR/USD", "AUD/USD"], data)
+    assert {symbol: r.error for symbol, r in results.items()} == {
+        "EUR/USD": "out of credits",
+        "AUD/USD": "out of credits",
+    }
+
+
+def test_malformed_responses_become_errors():
+    assert not parse_batch(["EUR/USD"], None)["EUR/USD"].ok
+    assert not parse_batch(["EUR/USD"], {"values": [{"datetime": "2024-01-01"}]})["EUR/USD"].ok
+    results = parse_batch(["EUR/USD", "AUD/USD"], ["not", "a", "dict"])
+    assert not any(r.ok for r in results.values())
+
+
+def test_chunked_dedupes_and_splits():
+    assert chunked(["A", "B", "A", "C", "D"], 2) == [["A", "B"], ["C", "D"]]
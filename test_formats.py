@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+import formats
+from formats import COLUMNS, JSON, MSGPACK, RAW, negotiate
+from store import Bar, PriceHistory
+
+
+@pytest.mark.parametrize("accept,fmt,expected", [
+    (None, None, JSON),
+    ("*/*", None, JSON),
+    ("text/html, application/*;q=0.8", None, JSON),
+    ("application/json;q=0.1, application/octet-stream", None, RAW),
+    ("application/vnd.silvercoin.columns+json;q=0.9, application/json;q=0.5", None, COLUMNS),
+    ("raw", None, RAW),
+    ("text/html", None, None),
+    ("application/json;q=0", None, None),
+    ("application/json;q=0, */*", None, COLUMNS),
+    ("application/json;q=0, application/vnd.silvercoin.columns+json;q=0, */*", None, RAW),
+    ("application/json;q=bogus", None, None),
+    ("*/*", "columns", COLUMNS),
+    (None, "raw", RAW),
+    (None, "xml", None),
+])
+def test_negotiate(accept, fmt, expected):
+    assert negotiate(accept, fmt) == expected
+
+
+def test_negotiate_skips_uninstalled_formats(monkeypatch):
+    monkeypatch.setattr(formats, "msgpack", None)
+    assert negotiate("application/msgpack") is None
+    assert negotiate(None, "msgpack") is None
+    assert negotiate("application/msgpack, application/json;q=0.5") == JSON
+
+
+@pytest.fixture
+def history():
+    history = PriceHistory(10)
+    history.extend(Bar(60_000 * i, 1.0 + i, 1.5 + i, 0.5 + i, 1.25 + i, 0.0) for i in range(4))
+    return history
+
+
+def test_encode_json_and_columns(history):
+    body, headers = formats.encode(JSON, history, 1, 3, {"pair": "EUR/USD"})
+    payload = json.loads(body)
+    assert headers == {}
+    assert [v["timestamp"] for v in payload["values"]] == [60_000, 120_000]
+
+    body, _ = formats.encode(COLUMNS, history, 1, 3, {"pair": "EUR/USD"})
+    columns = json.loads(body)["columns"]
+    assert list(columns) == list(history.FIELDS)
+    assert columns["close"] == [2.25, 3.25]
+
+
+def test_encode_raw_is_little_endian_columns(history):
+    body, headers = formats.encode(RAW, history, 0, 4, {"pair": "EUR/USD"})
+    assert headers["X-Rows"] == "4"
+    offset, columns = 0, {}
+    for spec in headers["X-Columns"].split(","):
+        name, dtype = spec.split(":")
+        dtype = np.dtype(dtype).newbyteorder("<")
+        columns[name] = np.frombuffer(body, dtype=dtype, count=4, offset=offset)
+        offset += 4 * dtype.itemsize
+    assert offset == len(body)
+    assert columns["timestamp"].tolist() == [0, 60_000, 120_000, 180_000]
+    assert columns["close"].tolist() == history.closes().tolist()
+    assert json.loads(headers["X-Meta"]) == {"pair": "EUR/USD"}
+
+
+def test_encode_msgpack_round_trips(history):
+    msgpack = pytest.importorskip("msgpack")
+    body, _ = formats.encode(MSGPACK, history, 0, 4, {"pair": "EUR/USD"})
+    assert msgpack.unpackb(body)["columns"]["open"] == [1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+import indicators
+
+SIZES = [0, 1, 5, 13, 14, 15, 27, 40, 3000]
+
+
+def series(n, seed=1):
+    rng = np.random.default_rng(seed)
+    closes = 1.1 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    highs = closes * (1 + np.abs(rng.normal(0, 5e-4, n)))
+    lows = closes * (1 - np.abs(rng.normal(0, 5e-4, n)))
+    return highs, lows, closes
+
+
+def as_array(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def assert_same(batch, stream):
+    batch, stream = np.asarray(batch, dtype=np.float64), as_array(stream)
+    assert np.array_equal(np.isnan(batch), np.isnan(stream))
+    np.testing.assert_allclose(stream, batch, rtol=1e-9, atol=1e-12)
+
+
+def stream_columns(values, width):
+    return [as_array(v[k] if v is not None else None for v in values) for k in range(width)]
+
+
+# Each case: (batch function, streaming factory, inputs used, output width)
+CASES = {
+    "sma": (lambda h, l, c: indicators.sma(c, 20), lambda: indicators.SMA(20), "c", 1),
+    "ema": (lambda h, l, c: indicators.ema(c, 12), lambda: indicators.EMA(12), "c", 1),
+    "rsi_wilder": (lambda h, l, c: indicators.rsi(c, 14), lambda: indicators.RSI(14), "c", 1),
+    "rsi_simple": (lambda h, l, c: indicators.rsi(c, 14, "simple"), lambda: indicators.RSI(14, "simple"), "c", 1),
+    "macd": (lambda h, l, c: indicators.macd(c), indicators.MACD, "c", 3),
+    "bollinger": (lambda h, l, c: indicators.bollinger(c), indicators.Bollinger, "c", 3),
+    "atr": (lambda h, l, c: indicators.atr(h, l, c), indicators.ATR, "hlc", 1),
+    "stochastic": (lambda h, l, c: indicators.stochastic(h, l, c), indicators.Stochastic, "hlc", 2),
+}
+
+
+def inputs(kind, h, l, c):
+    return (c,) if kind == "c" else (h, l, c)
+
+
+def flatten(value, width):
+    """A streaming ``value`` as a list of floats, NaN where not ready."""
+    if value is None:
+        return [np.nan] * width
+    return as_array([value] if width == 1 else value).tolist()
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("n", SIZES)
+def test_streaming_matches_batch(name, n):
+    batch_fn, factory, kind, width = CASES[name]
+    h, l, c = series(n)
+    batch = batch_fn(h, l, c)
+    indicator = factory()
+    values = [indicator.update(*row) for row in zip(*inputs(kind, h, l, c))]
+    if width == 1:
+        assert_same(batch, values)
+    else:
+        for column, streamed in zip(batch, stream_columns(values, width)):
+            assert_same(column, streamed)
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("n", SIZES)
+def test_seed_then_update_matches_batch(name, n):
+    batch_fn, factory, kind, width = CASES[name]
+    h, l, c = series(n)
+    split = n // 2
+    indicator = factory()
+    indicator.seed(*(a[:split] for a in inputs(kind, h, l, c)))
+    for row in zip(*(a[split:] for a in inputs(kind, h, l, c))):
+        indicator.update(*row)
+
+    assert getattr(indicator, "count", n) == n
+    batch = batch_fn(h, l, c)
+    columns = [batch] if width == 1 else batch
+    expected = [col[-1] if n else np.nan for col in columns]
+    np.testing.assert_allclose(flatten(indicator.value, width), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_smooth_spans_several_blocks():
+    # Blocks are ~49 values at alpha = 0.5; without blocking, decay ** n
+    # underflows long before 5000 values.
+    values = np.random.default_rng(2).normal(size=5000)
+    for alpha in (0.5, 1 / 14, 1.0):
+        smoothed = indicators._smooth(values, alpha, 1.0)
+        expected, previous = [], 1.0
+        for value in values:
+            previous += alpha * (value - previous)
+            expected.append(previous)
+        np.testing.assert_allclose(smoothed, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_indicator_set_seed_then_update():
+    h, l, c = series(300)
+    streamed, seeded = indicators.IndicatorSet(), indicators.IndicatorSet()
+    for row in zip(h, l, c):
+        streamed.update(*row)
+    seeded.seed(h[:150], l[:150], c[:150])
+    for row in zip(h[150:], l[150:], c[150:]):
+        seeded.update(*row)
+    for name, value in streamed.snapshot().items():
+        assert seeded.snapshot()[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
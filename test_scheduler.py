@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+import scheduler
+from scheduler import Ticker
+
+
+class FakeClock:
+    """Wall and monotonic clocks that only move when slept or advanced."""
+
+    def __init__(self, wall, mono=500.0):
+        self.wall = wall
+        self.mono = mono
+        self.oversleep = 0.0
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+    async def sleep(self, seconds):
+        self.advance(seconds + self.oversleep)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(wall=1_700_000_010.0)  # 10 s past a minute boundary
+    monkeypatch.setattr(scheduler.time, "time", lambda: clock.wall)
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: clock.mono)
+    monkeypatch.setattr(scheduler.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_ticks_on_aligned_boundaries_plus_offset(clock):
+    async def run():
+        ticker = Ticker(60, offset=2)
+        boundaries = [await ticker.wait() for _ in range(3)]
+        assert boundaries == [1_700_000_042.0, 1_700_000_102.0, 1_700_000_162.0]
+        assert clock.wall == 1_700_000_162.0
+        assert ticker.ticks == 3 and ticker.missed == 0
+        assert ticker.last_lag == 0.0
+
+    asyncio.run(run())
+
+
+def test_overrun_skips_missed_ticks(clock):
+    async def run():
+        ticker = Ticker(60)
+        first = await ticker.wait()
+        clock.advance(150)  # work overran two and a half intervals
+        second = await ticker.wait()
+        # +60 and +120 have passed: +60 is skipped, and +120, the latest
+        # one passed, fires at once instead of both firing back to back.
+        assert second == first + 120
+        assert clock.wall == first + 150
+        assert ticker.missed == 1
+        assert ticker.last_lag == pytest.approx(30)
+        assert await ticker.wait() == first + 180
+        assert ticker.ticks == 3
+
+    asyncio.run(run())
+
+
+def test_lag_is_measured_against_the_deadline(clock):
+    async def run():
+        clock.oversleep = 0.25
+        ticker = Ticker(60)
+        await ticker.wait()
+        assert ticker.last_lag == pytest.approx(0.25)
+        stats = ticker.stats()
+        assert stats["last_lag_ms"] == 250.0 and stats["max_lag_ms"] == 250.0
+
+    asyncio.run(run())
+
+
+def test_rejects_non_positive_interval():
+    with pytest.raises(ValueError):
+        Ticker(0)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from app import signal_engine
+from app.signal_engine import CrossoverEngine, EngineRegistry
+
+
+def naive_signal(prices, short, long):
+    if len(prices) < long:
+        return "WAIT"
+    short_mean = np.mean(prices[-short:])
+    long_mean = np.mean(prices[-long:])
+    tolerance = 1e-12 * max(abs(short_mean), abs(long_mean))
+    if short_mean > long_mean + tolerance:
+        return "BUY"
+    if short_mean < long_mean - tolerance:
+        return "SELL"
+    return "HOLD"
+
+
+@pytest.mark.parametrize("short,long", [(1, 1), (2, 5), (5, 10), (7, 7)])
+def test_generate_matches_full_recompute(short, long):
+    prices = np.round(100 + np.cumsum(np.random.default_rng(long).normal(0, 1, 300)), 1).tolist()
+    engine = CrossoverEngine(short, long)
+    for i, price in enumerate(prices):
+        assert engine.generate(price)["signal"] == naive_signal(prices[:i + 1], short, long)
+    assert engine.window() == prices[-long:]
+    assert len(engine) == long
+
+
+def test_means_stay_exact_across_resync():
+    engine = CrossoverEngine(3, 5, resync=7)
+    prices = [1e6 + 0.1 * i for i in range(50)]
+    for price in prices:
+        engine.update(price)
+    assert engine.short_mean == pytest.approx(np.mean(prices[-3:]), rel=1e-15)
+    assert engine.long_mean == pytest.approx(np.mean(prices[-5:]), rel=1e-15)
+
+
+def test_rejects_bad_windows():
+    with pytest.raises(ValueError):
+        CrossoverEngine(10, 5)
+    with pytest.raises(ValueError):
+        CrossoverEngine(0, 5)
+
+
+def test_registry_isolates_symbols_and_evicts_lru():
+    registry = EngineRegistry(max_symbols=2, idle_ttl=0)
+    for price in range(1, 11):
+        registry.get("A").update(float(price))
+    assert len(registry.get("B")) == 0
+    assert len(registry.get("A")) == 10
+
+    registry.get("C")  # B is now least recently used
+    assert "B" not in registry and "A" in registry and "C" in registry
+    assert registry.evicted == 1
+
+
+def test_registry_drops_idle_engines(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(signal_engine.time, "monotonic", lambda: now[0])
+    registry = EngineRegistry(idle_ttl=60)
+    registry.get("A")
+    now[0] += 61
+    registry.get("B")
+    assert "A" not in registry and registry.evicted == 1
+
+
+@pytest.mark.parametrize("case", range(200))
+def test_crossover_batch_matches_generate(case):
+    rng = np.random.default_rng(case)
+    short = int(rng.integers(1, 8))
+    engine_args = (short, int(rng.integers(short, 16)))
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, int(rng.integers(1, 80)))), int(rng.integers(0, 3)))
+    chunks = np.split(prices, np.sort(rng.integers(0, prices.size, int(rng.integers(0, 4)))))
+
+    sequential, batched = CrossoverEngine(*engine_args), CrossoverEngine(*engine_args)
+    expected = [sequential.generate(price)["signal"] for price in prices.tolist()]
+    labels = []
+    for chunk in chunks:
+        labels += batched.generate_batch(chunk)
+
+    assert labels == expected
+    assert batched.window() == sequential.window()
+    assert len(batched) == len(sequential)
+    assert batched.generate(101.0) == sequential.generate(101.0)
+
+
+def test_stateless_batch_leaves_live_state_alone(monkeypatch):
+    monkeypatch.setattr(signal_engine, "registry", EngineRegistry())
+    for price in range(1, 11):
+        signal_engine.generate_signal(float(price), "X")
+    before = signal_engine.registry.get("X").window()
+    signal_engine.generate_signals([5.0, 4.0, 3.0], "X", stateless=True)
+    assert signal_engine.registry.get("X").window() == before
+    assert signal_engine.generate_signals([], "X") == []
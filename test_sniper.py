@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from sniper import RSI, calc_rsi, sniper_signal
+from store import Bar, PriceHistory
+
+SIZES = [0, 1, 5, 13, 14, 15, 27, 40, 3000]
+
+
+def closes(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return (1.1 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))).tolist()
+
+
+def baseline_calc_rsi(prices, period=14):
+    # sniper.calc_rsi as it was before the incremental RSI
+    if len(prices) < period + 1:
+        return None
+    changes = np.diff(prices)
+    avg_gain = np.mean(np.maximum(changes, 0)[-period:])
+    avg_loss = np.mean(np.maximum(-changes, 0)[-period:])
+    if avg_loss == 0:
+        return 100
+    return round(100 - (100 / (1 + avg_gain / avg_loss)), 2)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_calc_rsi_matches_baseline(n):
+    prices = closes(n)
+    assert calc_rsi(prices) == baseline_calc_rsi(prices)
+
+
+def test_calc_rsi_known_values():
+    assert calc_rsi([1, 2, 3, 2, 4, 5, 3, 4, 5, 6, 7, 6, 5, 6, 7, 8]) == 68.75
+    assert calc_rsi(list(range(20))) == 100
+    assert calc_rsi([1, 2, 3]) is None
+
+
+@pytest.mark.parametrize("smoothing", ["wilder", "simple"])
+def test_rsi_update_matches_seed(smoothing):
+    prices = closes(300)
+    streamed = RSI(14, smoothing)
+    for price in prices:
+        value = streamed.update(price)
+    assert value == RSI(14, smoothing).seed(prices)
+
+
+def test_rsi_not_ready_until_period_changes():
+    rsi = RSI(14)
+    assert [rsi.update(price) for price in closes(15)][:14] == [None] * 14
+    assert rsi.ready
+
+
+def test_sniper_signal_accepts_columnar_history():
+    prices = closes(30)
+    history = PriceHistory(50)
+    history.extend(Bar(i, p, p, p, p) for i, p in enumerate(prices))
+    records = [{"close": p} for p in prices]
+    structured = np.array([(p,) for p in prices], dtype=[("close", "f8")])
+
+    results = [sniper_signal(h) for h in (history, np.array(prices), structured, records)]
+    for result in results:
+        result.pop("time")
+    assert all(result == results[0] for result in results)
+    assert results[0]["rsi"] == calc_rsi(prices)
+    assert sniper_signal(records[:10]) == {"signal": "WAIT", "confidence": 0}
@@ -0,0 +1,64 @@
+import pytest
+
+from store import Bar, PriceHistory
+
+
+def bars(start, count):
+    return [Bar(1000 * i, i, i + 0.5, i - 0.5, i + 0.25, 10 * i) for i in range(start, start + count)]
+
+
+def test_price_history_wraparound():
+    history = PriceHistory(5)
+    for bar in bars(0, 3):
+        history.append(bar)
+    history.extend(bars(3, 6))
+    history.append(bars(9, 1)[0])
+
+    assert len(history) == 5
+    assert history.closes().tolist() == [i + 0.25 for i in range(5, 10)]
+    assert history.timestamps(2).tolist() == [8000, 9000]
+    assert list(history.last()) == list(bars(9, 1)[0])
+    assert [r["timestamp"] for r in history.to_records(3)] == [7000, 8000, 9000]
+    with pytest.raises(ValueError):
+        history.closes()[0] = 0
+
+
+def test_price_history_extend_keeps_latest_capacity():
+    history = PriceHistory(4)
+    history.extend(bars(0, 10))
+    assert history.timestamps().tolist() == [6000, 7000, 8000, 9000]
+
+
+def test_price_history_returns_views():
+    history = PriceHistory(3)
+    history.extend(bars(0, 5))
+    closes = history.closes()
+    assert closes.base is not None  # a view into the ring, not a copy
+    assert closes.tolist() == [2.25, 3.25, 4.25]
+
+
+def test_price_history_needs_capacity():
+    with pytest.raises(ValueError):
+        PriceHistory(0)
+
+
+def test_price_history_search():
+    history = PriceHistory(5)
+    history.extend(bars(0, 8))  # keeps timestamps 3000..7000
+
+    assert history.search() == (0, 5)
+    assert history.search(since=4000) == (1, 5)
+    assert history.search(since=4500, until=6000) == (2, 4)
+    assert history.search(until=2000) == (0, 0)
+    assert history.search(since=9000) == (5, 5)
+    lo, hi = history.search(since=5000, until=6000)
+    assert history.window("close", lo, hi).tolist() == [5.25, 6.25]
+
+
+def test_price_history_records_window():
+    history = PriceHistory(5)
+    history.extend(bars(0, 5))
+    lo, hi = history.search(since=1000, until=2000)
+    records = history.records(lo, hi)
+    assert [r["timestamp"] for r in records] == [1000, 2000]
+    assert set(records[0]) == {"datetime", "timestamp", "open", "high", "low", "close", "volume"}
@@ -0,0 +1,123 @@
+import asyncio
+
+import aiohttp
+
+from telegram import TelegramOutbox, coalesce
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self.payload = payload
+
+    async def json(self, content_type=None):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeSession:
+    """Replays scripted responses and records what was posted."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.posted = []
+
+    def post(self, url, data):
+        self.posted.append(data["text"])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+OK = FakeResponse(200, {"ok": True})
+
+
+def outbox(session, **kwargs):
+    kwargs.setdefault("linger", 0)
+    return TelegramOutbox("token", "chat", session, backoff=0.001, max_backoff=0.01,
+                          global_rate=1000, chat_rate=1000, **kwargs)
+
+
+def test_coalesce_packs_texts_up_to_limit():
+    assert coalesce(["a", "b", "c"], limit=3) == ["a\nb", "c"]
+    assert coalesce(["abcdefg"], limit=3) == ["abc", "def", "g"]
+    assert coalesce(["ab", "abcdefg", "x"], limit=3) == ["ab", "abc", "def", "g\nx"]
+    assert coalesce([]) == []
+
+
+def test_burst_is_coalesced_into_one_message():
+    async def run():
+        session = FakeSession([OK])
+        async with outbox(session, linger=0.01) as box:
+            for text in ("one", "two", "three"):
+                box.send(text)
+            await box.flush()
+            assert session.posted == ["one\ntwo\nthree"]
+            assert (box.sent, box.coalesced) == (1, 2)
+
+    asyncio.run(run())
+
+
+def test_retries_429_server_errors_and_empty_bodies():
+    async def run():
+        session = FakeSession([
+            FakeResponse(429, {"ok": False, "parameters": {"retry_after": 0.001}}),
+            FakeResponse(429, None),
+            FakeResponse(500, {"ok": False}),
+            aiohttp.ClientConnectionError(),
+            FakeResponse(200, ValueError("bad json")),
+            OK,
+        ])
+        async with outbox(session, max_attempts=6) as box:
+            box.send("alert")
+            await box.flush()
+            assert (box.sent, box.failed) == (1, 0)
+            assert len(session.posted) == 6
+
+    asyncio.run(run())
+
+
+def test_client_error_is_not_retried_and_worker_survives():
+    async def run():
+        session = FakeSession([FakeResponse(400, {"ok": False}), RuntimeError("boom"), OK])
+        async with outbox(session) as box:
+            box.send("rejected")
+            await box.flush()
+            box.send("crashes")
+            await box.flush()
+            box.send("delivered")
+            await box.flush()
+            assert (box.sent, box.failed) == (1, 2)
+            assert session.posted == ["rejected", "crashes", "delivered"]
+
+    asyncio.run(run())
+
+
+def test_gives_up_after_max_attempts():
+    async def run():
+        session = FakeSession([FakeResponse(502, {"ok": False})] * 3)
+        async with outbox(session, max_attempts=3) as box:
+            box.send("alert")
+            await box.flush()
+            assert (box.sent, box.failed) == (0, 1)
+
+    asyncio.run(run())
+
+
+def test_unconfigured_outbox_drops_messages():
+    async def run():
+        box = TelegramOutbox(None, None, None)
+        box.send("alert")
+        await box.flush()
+        assert not box.configured
+        assert (box.sent, box.failed) == (0, 0)
+
+    asyncio.run(run())